@@ -27,10 +27,27 @@ import datetime as dt
 import pandas as pd
 import re
 import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import time
+import functools
+import contextlib
+import tracemalloc
+import cProfile
+import pstats
+import unicodedata
+from html import escape
+from glob import glob
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
 
 from html2latex import html2latex
 
-# store session length config in a class to allow using them in match case
+# store session length config in a class, the DSP tables have one column per
+# default length slot
 sessionlengths = lambda: None
 
 ####### vvvvvv CHANGE THIS vvvvvv ########### <--------------------------------------------------------------------------
@@ -38,16 +55,87 @@ sessionlengths = lambda: None
 sessionlengths.default = 15
 ####### ^^^^^^ CHANGE THIS ^^^^^^ ########### <--------------------------------------------------------------------------
 
-sessionlengths.double = 2*sessionlengths.default
-sessionlengths.threeHalf = int(1.5*sessionlengths.default)
-
 subsession_separation_chars = "[._]"  # regex pattern to split sessions like A01_01 or S06c.05 into their parent sessions A01 and S06c at chars . or _
 
+# Parquet needs pyarrow, without it the typed sessions cache falls back to pickle.
+# It is only looked up, pandas imports it when the cache is read or written.
+cache_format = 'parquet' if importlib.util.find_spec('pyarrow') is not None else 'pkl'
+cache_version = b'2'  # bump whenever read_sessions_csv changes the cached layout
+
 ################################################################################
-# cleaner routine that handles all characters giving plain pdflatex trouble    #
+# Instrumentation for --profile: the stages, writers and converters are        #
+# wrapped in timers counting calls and inclusive seconds, the characters of    #
+# the strings they return and the bytes the TexWriters emit while they run.    #
+# Disabled, a timer only costs an extra function call. Work done in the        #
+# worker processes of --jobs is only seen as part of its caller.               #
 ################################################################################
-def utf8_clean(instr):
-	utf8_to_latex = {
+class Profile:
+	def __init__(self):
+		self.enabled = False
+		self.memory = False  # tracemalloc peak per top-level stage
+		self.stats = {}
+		self.active = []
+	
+	def stat(self, name):
+		if name not in self.stats:
+			self.stats[name] = {'calls': 0, 'seconds': 0.0, 'chars': 0, 'bytes': 0}
+		return self.stats[name]
+	
+	def timed(self, name):
+		def decorator(func):
+			@functools.wraps(func)
+			def wrapper(*args, **kwargs):
+				if not self.enabled:
+					return func(*args, **kwargs)
+				with self.stage(name) as stat:
+					result = func(*args, **kwargs)
+					if isinstance(result, str):
+						stat['chars'] += len(result)
+				return result
+			return wrapper
+		return decorator
+	
+	@contextlib.contextmanager
+	def stage(self, name):
+		if not self.enabled:
+			yield {}
+			return
+		stat = self.stat(name)
+		peak = self.memory and not self.active
+		if peak:
+			tracemalloc.reset_peak()
+		self.active.append(stat)
+		tic = time.perf_counter()
+		try:
+			yield stat
+		finally:
+			stat['seconds'] += time.perf_counter() - tic
+			stat['calls'] += 1
+			self.active.pop()
+			if peak:
+				stat['peak_bytes'] = max(stat.get('peak_bytes', 0), tracemalloc.get_traced_memory()[1])
+	
+	# bytes written to a file count for all stages currently running
+	def emitted(self, nbytes):
+		for stat in self.active:
+			stat['bytes'] += nbytes
+	
+	def summary(self):
+		return {name: dict(stat) for name, stat in self.stats.items()}
+
+profile = Profile()
+html2latex = profile.timed('html2latex')(html2latex)
+
+################################################################################
+# cleaner routine that handles all characters giving plain pdflatex trouble.   #
+# The map is compiled once into a single regex, the longer keys first and the  #
+# single characters as one character class, so a call is one pass over the     #
+# text however many entries there are. A map of a single key, like the         #
+# shipped one, is applied with str.replace, which is faster still. Further     #
+# entries can be given as a JSON object in utf8_to_latex.json next to this     #
+# file.                                                                        #
+################################################################################
+utf8_to_latex = {
 	" &": " \&",
 	# "#": "\\#",
 	# "Γ": "\\ensuremath\\Gamma ",
@@ -85,21 +173,38 @@ def utf8_clean(instr):
 	# "^m": "\\textsuperscript{m}",
 	# "\percent": "\%", # we replaced % by \percent in html2latex
 	# "\&=": "&="
-	}
+}
 
-	for key, value in utf8_to_latex.items():
-		instr = instr.replace(key, value)
-	return instr
+utf8_map_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utf8_to_latex.json')
+
+def load_utf8_map(fname):
+	with open(fname, 'r', encoding='utf-8') as f:
+		return json.load(f)
+
+def compile_utf8_map(mapping):
+	multi = sorted((key for key in mapping if len(key) > 1), key=len, reverse=True)
+	singles = ''.join(re.escape(key) for key in mapping if len(key) == 1)
+	alternatives = [re.escape(key) for key in multi] + ([f'[{singles}]'] if singles else [])
+	return re.compile('|'.join(alternatives)) if alternatives else None
+
+if os.path.exists(utf8_map_file):
+	utf8_to_latex.update(load_utf8_map(utf8_map_file))
+utf8_pattern = compile_utf8_map(utf8_to_latex)
+utf8_single = next(iter(utf8_to_latex.items())) if len(utf8_to_latex) == 1 else None
+
+@profile.timed('utf8_clean')
+def utf8_clean(instr):
+	if utf8_single is not None:
+		return instr.replace(*utf8_single)
+	if utf8_pattern is None:
+		return instr
+	return utf8_pattern.sub(lambda match: utf8_to_latex[match.group()], instr)
 
 ################################################################################
-# for the daily schedule we need to know how long a contribution is,           #
-# and advance time by 20 minutes                                               #
+# for the daily schedule we need to know how long a session is,                #
+# and advance time by 20 minutes. Durations and start offsets of the           #
+# contributions are precomputed in minutes by melt_contributions.              #
 ################################################################################
-# get time difference in minutes
-def get_duration(start, end):
-	dt1 = dt.datetime.fromisoformat(start)
-	dt2 = dt.datetime.fromisoformat(end)
-	return int((dt2-dt1).total_seconds() / 60)
 def get_ses_length(session):
 	return int(( session.session_end - session.session_start ).total_seconds() / 60)
 
@@ -130,96 +235,83 @@ def get_section_info(org, section):
 
 def get_session_info(session):
 	
-	start = session['session_start']
-	end   = session['session_end']
+	start = session.session_start
+	end   = session.session_end
 	
-	chairs = []
-	for i in range(10):
-		if f'chair{i}' in session.keys():
-			chairs.append(str( session[f'chair{i}'] ))
-	chairs = r' \newline '.join(chairs)
+	chairs = r' \newline '.join(session.chairs)
 
 	session = {
 		"chairs"   : chairs,
-		"number"   : session['session_short'],
-		"name"     : session['session_title'],
-		"room"     : session['session_room'],
+		"number"   : session.session_short,
+		"name"     : session.session_title,
+		"room"     : session.session_room,
 		"start"    : start.strftime("%H:%M"),
 		"end"      : end.strftime("%H:%M"),
 		"date"     : start.strftime("%B %d, %Y")
 	}
 	return session
 
-# for a given session, get the nth presentation's info
-def get_contribution_info(session, idx, RvML=False):
-	
-	if not f'p{idx}_title' in session.keys():
-		return None
-	
-	ptitle     = f'p{idx}_title'
-	pauthors   = f'p{idx}_authors'
-	porgas     = f'p{idx}_organisations'
-	ppresenter = f'p{idx}_presenting_author'
-	pabstract  = f'p{idx}_abstract'
-	pstart     = f'p{idx}_start'
-	pend       = f'p{idx}_end'
-	
-	# if session['session_short'] == "A04_06":
-	# 	print(session.to_string())
-	# 	print(idx)
-	
-	presenter = session[ppresenter]
-	if pd.isna(presenter):
-		return None
-	authors = session[pauthors]
-	authors = authors.replace(presenter, f'\\presenter{{{presenter}}}')
-	presenter = re.sub(r'(\s*\(\d+(,\d+)*\))?,?$', '', presenter)  # remove orga footnote thingies
-	
-	if session['session_short'].startswith('Poster'):
-		duration = 0
-	else:
-		duration = get_duration(session[pstart], session[pend])
-	if session[pabstract] != session[pabstract]:
+# the presenter without the footnote marks of the organisations
+def presenter_name(presenter):
+	return re.sub(r'(\s*\(\d+(,\d+)*\))?,?$', '', presenter)
+
+# label of the page of a contribution's presenter, see the speaker index below
+def presenter_label(contribution):
+	return f'presenter-{re.sub(r"[^A-Za-z0-9.]", "-", contribution.session_short)}-{contribution.idx}'
+
+# for a given session and one of its rows in the contributions table, get the
+# presentation's info
+def get_contribution_info(session, contribution, RvML=False):
+	
+	presenter = contribution.presenter
+	label = presenter_label(contribution)
+	authors = contribution.authors
+	authors = authors.replace(presenter, f'\\presenter[{label}]{{{presenter}}}')
+	presenter = presenter_name(presenter)
+	
+	if contribution.abstract != contribution.abstract:
 		abstract = ''
 	else:
-		abstract = html2latex(session[pabstract])
+		abstract = html2latex(contribution.abstract)
 	if RvML:
-		start = dt.datetime.fromisoformat(session[pstart]).strftime('%H:%M')
-		end   = dt.datetime.fromisoformat(session[pend]).strftime('%H:%M')
+		start = contribution.start.strftime('%H:%M')
+		end   = contribution.end.strftime('%H:%M')
 	else:
-		start = session[pstart]
-		end   = session[pend]
+		start = contribution.start
+		end   = contribution.end
 	
 	contribution = {
-		"title"         : latexEscape(session[ptitle]),
+		"title"         : latexEscape(contribution.title),
 		"authors"       : authors,
 		"presenter"     : presenter,
+		"label"         : label,
 		"start"         : start,
 		"end"           : end,
-		"duration"      : duration,
+		"duration"      : contribution.duration,
+		"offset"        : contribution.offset,
 		"abstract"      : abstract,
-		"organizations" : session[porgas]
+		"organizations" : contribution.organisations
 	}
 	return contribution
 
-def get_plenary_info(row):
-	start = row['session_start']
-	end   = row['session_end']
-	if pd.isna(row['chair1']):
+# plenaries consist of a single contribution, the first one of the session
+def get_plenary_info(row, contribution):
+	start = row.session_start
+	end   = row.session_end
+	if pd.isna(row.chair1):
 		chair = r'\color{red} NOT AVAILABLE'
 	else:
-		chair = row['chair1']
-	if pd.isna(row['p1_organisations']):
-		speaker = r'\presenter{' + row['p1_presenting_author'] + '}'
-	else:
-		speaker = r'\presenter{' + row['p1_presenting_author'] + '} {\\em (' + row['p1_organisations'] + ')}'
+		chair = row.chair1
+	speaker = f'\\presenter[{presenter_label(contribution)}]{{{contribution.presenter}}}'
+	if not pd.isna(contribution.organisations):
+		speaker += ' {\\em (' + contribution.organisations + ')}'
 	contribution = {
-		"session"  : row['session_short'],
-		"title"    : row['p1_title'],
+		"session"  : row.session_short,
+		"title"    : contribution.title,
 		"speaker"  : speaker,
-		"abstract" : html2latex(row['p1_abstract']),
+		"abstract" : html2latex(contribution.abstract),
 		"chair"    : chair,
-		"room"     : row['session_room'],
+		"room"     : row.session_room,
 		"start"    : start.strftime("%H:%M"),
 		"end"      : end.strftime("%H:%M"),
 		"date"     : start.strftime("%B %d, %Y")
@@ -229,6 +321,124 @@ def get_plenary_info(row):
 ################################################################################
 # helpers for writing the actual section files in LaTeX                        #
 ################################################################################
+# Output files are written fragment by fragment: every write cleans the joined
+# fragments with utf8_clean and passes them straight on to the file, so the
+# generated documents are never assembled in memory as a whole. Static parts
+# like templates are passed through with clean=False.
+# Given a manifest and the sources the file is generated from, the file is
+# left untouched if the sources did not change since it was last written. The
+# writer then ignores all writes, see Manifest below. A rewritten file is only
+# recorded in the manifest once it was completed without an exception.
+class TexWriter:
+	def __init__(self, fname, manifest=None, sources=()):
+		self.fname = fname
+		self.manifest = manifest
+		self.unchanged = manifest is not None and manifest.current(fname, *sources)
+		self.file = None if self.unchanged else open(fname, 'w', encoding='utf-8')
+	
+	def write(self, *fragments, clean=True):
+		if self.file is None:
+			return
+		chunk = ''.join(fragments)
+		if clean:
+			chunk = utf8_clean(chunk)
+		self.file.write(chunk)
+		if profile.enabled:
+			profile.emitted(len(chunk.encode('utf-8')))
+	
+	def close(self):
+		if self.file is not None:
+			self.file.close()
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, exc_type, *exc):
+		self.close()
+		if exc_type is None and self.manifest is not None and not self.unchanged:
+			self.manifest.record(self.fname)
+
+################################################################################
+# Dependency manifest for incremental regeneration: it maps every generated    #
+# file to a hash of the session rows it is generated from and of the           #
+# generator configuration (the sources of this file and html2latex.py, the     #
+# utf8 map). Files whose hash did not change are not rewritten, so their       #
+# mtime stays and latexmk only recompiles the documents that actually change.  #
+################################################################################
+manifest_file = './LaTeX/.manifest.json'
+html2latex_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'html2latex.py')
+
+def hash_config():
+	config = hashlib.sha256()
+	for fname in (os.path.abspath(__file__), html2latex_file):
+		with open(fname, 'rb') as f:
+			config.update(f.read())
+	config.update(json.dumps(utf8_to_latex, sort_keys=True).encode())
+	return config.digest()
+
+# the abstracts only appear in the BoA, the schedules are hashed without them
+def schedule_columns(sessions):
+	return sessions[[col for col in sessions.columns if not re.fullmatch(r'p\d+_abstract', col)]]
+
+class Manifest:
+	def __init__(self, fname=manifest_file, force=False):
+		self.fname = fname
+		self.entries = {}
+		if not force and os.path.exists(fname):
+			with open(fname, 'r') as f:
+				self.entries = json.load(f)
+		self.config = hash_config()
+		self.pending = {}
+		self.seen = set()
+		self.written = 0
+		self.unchanged = 0
+	
+	# the rows of a table are identified by their short title, as in
+	# changed_sessions, not by their position in the CSV, so reordering the
+	# export does not rewrite any file
+	def key(self, *sources):
+		key = hashlib.sha256(self.config)
+		for source in sources:
+			if isinstance(source, pd.DataFrame):
+				key.update(repr(list(source.columns)).encode())
+				rows = pd.DataFrame({'hash': pd.util.hash_pandas_object(source, index=False).to_numpy()})
+				if 'session_short' in source.columns:
+					rows['session_short'] = source['session_short'].astype(str).to_numpy()
+					rows = rows.sort_values(['session_short', 'hash'])
+				key.update(rows['hash'].to_numpy().tobytes())
+			else:
+				key.update(repr(source).encode())
+		return key.hexdigest()
+	
+	# True if fname exists and was generated from the same sources. Otherwise
+	# its entry is dropped until the caller has rewritten the file and calls
+	# record, so a failed write is redone by the next run.
+	def current(self, fname, *sources):
+		key = self.key(*sources)
+		self.seen.add(fname)
+		if self.entries.get(fname) == key and os.path.exists(fname):
+			self.unchanged += 1
+			return True
+		self.entries.pop(fname, None)
+		self.pending[fname] = key
+		return False
+	
+	def record(self, fname):
+		self.entries[fname] = self.pending.pop(fname)
+		self.written += 1
+	
+	# drop the entries of the files in outdir that were not generated since
+	# the manifest was loaded, e.g. of sessions or rooms no longer in the program
+	def prune(self, outdir):
+		for fname in [fname for fname in self.entries if fname.startswith(outdir) and fname not in self.seen]:
+			del self.entries[fname]
+	
+	def save(self):
+		with open(self.fname, 'w') as f:
+			json.dump(self.entries, f, indent=1, sort_keys=True)
+		print(f'{self.written} files written, {self.unchanged} unchanged files left untouched')
+		self.written = self.unchanged = 0
+
 def latexEscape(string):
 	# string = string.replace('\\', r'\backslash')
 	return string
@@ -259,75 +469,70 @@ def getTableColWidth(n,factor=1):
 	
 	return f'{{{availableWidth}cm}}'
 
-def write_PML(df, outdir):
-	file = open(outdir+'/PML.tex', 'w', encoding='utf-8')
-	for _, row in df.iterrows():
-		PML = get_plenary_info(row)
-		ostring  = f'\\Prandtl{{{PML["title"]}}}%\n'
-		ostring += f'        {{{PML["session"]}}}%\n'
-		ostring += f'        {{{PML["speaker"]}}}%\n'
-		ostring += f'        {{{PML["date"]}}}%\n'
-		ostring += f'        {{{PML["start"]}}}%\n'
-		ostring += f'        {{{PML["end"]}}}%\n'
-		ostring += f'        {{{PML["room"]}}}%\n'
-		ostring += f'        {{{PML["chair"]}}}%\n'
-		ostring += f'        {{{PML["abstract"]}}}%\n'
-		ostring = utf8_clean(ostring)
-		file.write(ostring)
-		file.close()
+@profile.timed('write_PML')
+def write_PML(df, contributions, outdir, manifest=None):
+	with TexWriter(outdir+'/PML.tex', manifest, (df,)) as out:
+		for row in session_records(df):
+			if row.label not in contributions:
+				print(f"warning: no lecture found in session {row.session_short}")
+				continue
+			PML = get_plenary_info(row, contributions[row.label][0])
+			out.write(f'\\Prandtl{{{PML["title"]}}}%\n',
+					  f'        {{{PML["session"]}}}%\n',
+					  f'        {{{PML["speaker"]}}}%\n',
+					  f'        {{{PML["date"]}}}%\n',
+					  f'        {{{PML["start"]}}}%\n',
+					  f'        {{{PML["end"]}}}%\n',
+					  f'        {{{PML["room"]}}}%\n',
+					  f'        {{{PML["chair"]}}}%\n',
+					  f'        {{{PML["abstract"]}}}%\n')
 	return '\\input{PML.tex}\n'
 
-def write_PL(df, outdir):
-	inputs = ''
-	for _, row in df.iterrows():
-		PL = get_plenary_info(row)
+@profile.timed('write_PL')
+def write_PL(df, contributions, outdir, manifest=None):
+	inputs = []
+	for row in session_records(df):
+		if row.label not in contributions:
+			print(f"warning: no lecture found in session {row.session_short}")
+			continue
+		PL = get_plenary_info(row, contributions[row.label][0])
 		fname = f'{PL["session"]}.tex'
-		file = open(outdir+'/'+fname, 'w', encoding='utf-8')
-		ostring  = f'\\Plenary{{{PL["title"]}}}%\n'
-		ostring += f'        {{{PL["session"]}}}%\n'
-		ostring += f'        {{{PL["speaker"]}}}%\n'
-		ostring += f'        {{{PL["date"]}}}%\n'
-		ostring += f'        {{{PL["start"]}}}%\n'
-		ostring += f'        {{{PL["end"]}}}%\n'
-		ostring += f'        {{{PL["room"]}}}%\n'
-		ostring += f'        {{{PL["chair"]}}}\n'
-		ostring += f'        {{{PL["abstract"]}}}%\n'
-		ostring = utf8_clean(ostring)
-		file.write(ostring)
-		file.close()
-		inputs += f'\\input{{{fname}}}\n'
-	return inputs
-
-def write_RvML(df, outdir):
-	file = open(outdir+'/RvML.tex', 'w', encoding='utf-8')
-	for _, row in df.iterrows():
-		date = row['session_start'].strftime("%B %d, %Y")
-		room = row['session_room']
-		ostring = ''
-		for j in range(1,3):
-			RvML = get_contribution_info(row,j, RvML=True)
-			if not pd.isna(row[f'p{j}_presenting_author']):
-				ostring += f'\\Mises{{{RvML["title"]}}}%\n'
-				ostring +=  '       {Richard von Mises Lecture}%\n'
-				ostring += f'       {{\\presenter{{{RvML["presenter"]}}}~{{\\em({RvML["organizations"]})}}}}%\n'
-				ostring += f'       {{{date}}}%\n'
-				ostring += f'       {{{RvML["start"]}}}%\n'
-				ostring += f'       {{{RvML["end"]}}}%\n'
-				ostring += f'       {{{room}}}{{}}%\n'
-		ostring = utf8_clean(ostring)
-		file.write(ostring)
-		file.close()
+		with TexWriter(outdir+'/'+fname, manifest, (df.loc[[row.label]],)) as out:
+			out.write(f'\\Plenary{{{PL["title"]}}}%\n',
+					  f'        {{{PL["session"]}}}%\n',
+					  f'        {{{PL["speaker"]}}}%\n',
+					  f'        {{{PL["date"]}}}%\n',
+					  f'        {{{PL["start"]}}}%\n',
+					  f'        {{{PL["end"]}}}%\n',
+					  f'        {{{PL["room"]}}}%\n',
+					  f'        {{{PL["chair"]}}}\n',
+					  f'        {{{PL["abstract"]}}}%\n')
+		inputs.append(f'\\input{{{fname}}}\n')
+	return ''.join(inputs)
+
+@profile.timed('write_RvML')
+def write_RvML(df, contributions, outdir, manifest=None):
+	with TexWriter(outdir+'/RvML.tex', manifest, (df,)) as out:
+		for row in session_records(df):
+			date = row.session_start.strftime("%B %d, %Y")
+			room = row.session_room
+			for contribution in contributions.get(row.label, []):
+				if contribution.idx in (1, 2):
+					RvML = get_contribution_info(row, contribution, RvML=True)
+					out.write(f'\\Mises{{{RvML["title"]}}}%\n',
+							   '       {Richard von Mises Lecture}%\n',
+							  f'       {{\\presenter[{RvML["label"]}]{{{RvML["presenter"]}}}~{{\\em({RvML["organizations"]})}}}}%\n',
+							  f'       {{{date}}}%\n',
+							  f'       {{{RvML["start"]}}}%\n',
+							  f'       {{{RvML["end"]}}}%\n',
+							  f'       {{{room}}}{{}}%\n')
 	return '\\input{RvML.tex}\n'
 
-def write_section(org, sessionBlock, sessions, outdir, toc_sessions_silent=False):
-	sessions = sessions[sessions['session_short'].str.startswith(sessionBlock)]
-	
-	if sessions.empty:
-		return
-	
+# sessions holds the sessions of the block only, see index_blocks
+@profile.timed('write_section')
+def write_section(org, sessionBlock, sessions, contributions, outdir, toc_sessions_silent=False, manifest=None):
 	fname = sessionBlock.replace(' ', '_')
 	fullname = outdir+'/'+fname+'.tex'
-	file = open(fullname, 'w', encoding='utf-8')
 	
 	# EFDC change: efdc has no organizer info, the column track_type doesn't even exist
 	# title, organizers = get_section_info(org, sessionBlock)
@@ -337,44 +542,40 @@ def write_section(org, sessionBlock, sessions, outdir, toc_sessions_silent=False
 		print(f"warning: found varying titles for sessionBlock {sessionBlock}:\n{title}")
 	title = title[0]
 	
-	ostring  = f'\\Section{{{sessionBlock}: {title}}}%\n'
-	ostring += f'        {{{organizers}}}\n\n'
-
-	for _, row in sessions.iterrows():
-		S = get_session_info(row)
-		if toc_sessions_silent:
-			ostring += r'\SSession'
-		else:
-			ostring += r'\Session'
-		ostring += f'{{{S["number"]}}}%\n'
-		ostring += f'{{{S["name"]}}}%\n'
-		ostring += f'{{{S["date"]}}}%\n'
-		ostring += f'{{{S["start"]}}}%\n'
-		ostring += f'{{{S["end"]}}}%\n'
-		ostring += f'{{{S["room"]}}}%\n'
-		ostring += f'{{{S["chairs"]}}}%\n'
-		for i in range(100):
-			C = get_contribution_info(row, i)
-			if C is None:
-				continue
-			organizations = C["organizations"]
-			organizations = organizations.replace('; ','\\newline ')
-			start = re.sub('^.* ','', C["start"])
-			ostring += f'\\Contribution{{{C["title"]}}}%\n'
-			ostring += f'{{{C["authors"]}}}%\n'
-			ostring += f'{{{start}}}%\n'
-			ostring += f'{{{organizations}}}\n'
-			ostring += f'{{{html2latex(C["abstract"])}}}%\n'
-	ostring = utf8_clean(ostring)
-	file.write(ostring)
-	file.close()
+	with TexWriter(fullname, manifest, (sessions, sessionBlock, toc_sessions_silent)) as out:
+		if out.unchanged:
+			return fname
+		out.write(f'\\Section{{{sessionBlock}: {title}}}%\n',
+				  f'        {{{organizers}}}\n\n')
+		
+		for row in session_records(sessions):
+			S = get_session_info(row)
+			out.write(r'\SSession' if toc_sessions_silent else r'\Session',
+					  f'{{{S["number"]}}}%\n',
+					  f'{{{S["name"]}}}%\n',
+					  f'{{{S["date"]}}}%\n',
+					  f'{{{S["start"]}}}%\n',
+					  f'{{{S["end"]}}}%\n',
+					  f'{{{S["room"]}}}%\n',
+					  f'{{{S["chairs"]}}}%\n')
+			for contribution in contributions.get(row.label, []):
+				C = get_contribution_info(row, contribution)
+				organizations = C["organizations"]
+				organizations = organizations.replace('; ','\\newline ')
+				start = C["start"].strftime('%H:%M')
+				out.write(f'\\Contribution{{{C["title"]}}}%\n',
+						  f'{{{C["authors"]}}}%\n',
+						  f'{{{start}}}%\n',
+						  f'{{{organizations}}}\n',
+						  f'{{{C["abstract"]}}}%\n')
 	return fname
 
-def write_sections(organizers, sessions, outdir):
-	inputs = ''
+@profile.timed('write_sections')
+def write_sections(organizers, blocks, contributions, outdir, manifest=None):
+	inputs = []
 	# print(sessions["session_short"].str.rsplit(".",expand=True,n=1).iloc[:,0].unique())  # EFDC change: gamm splits at end, efdc at beginning
 	
-	for sessionBlock in sessions["session_short"].str.split(subsession_separation_chars,expand=True,n=1).iloc[:,0].unique():
+	for sessionBlock, sessions in blocks.items():
 		# if i == 6:
 		# 	fname = write_section(organizers, f'S{i:02}.1', sessions, outdir)
 		# 	inputs += f'\\input{{{fname}}}\n'
@@ -382,37 +583,76 @@ def write_sections(organizers, sessions, outdir):
 		# 	inputs += f'\\input{{{fname}}}\n'
 		# 	continue
 		
-		fname = write_section(organizers, sessionBlock, sessions, outdir)
-		inputs += f'\\input{{{fname}}}\n'
-	return inputs
-
-def write_minis(organizers, MS, YRM, outdir):
-	inputs = ''
-	for i in range(len(MS)):
-		name = f'MS{i+1}'
-		fname = write_section(organizers, name, MS, outdir,
-							  toc_sessions_silent=True)
-		inputs += f'\\input{{{fname}}}\n'
-
-	for i in range(len(YRM)):
-		name = f'YRM{i+1}'
-		fname = write_section(organizers, name, YRM, outdir,
-							  toc_sessions_silent=True)
-		inputs += f'\\input{{{fname}}}\n'
-	return inputs
-
-def write_dfg(organizers, df, outdir):
-	inputs = ''
-	for _, row in df.iterrows():
-		fname = write_section(organizers, row['session_short'], df, outdir,
-							  toc_sessions_silent=True)
-		inputs += f'\\input{{{fname}}}\n'
-	return inputs
+		fname = write_section(organizers, sessionBlock, sessions, contributions, outdir, manifest=manifest)
+		inputs.append(f'\\input{{{fname}}}\n')
+	return ''.join(inputs)
+
+# natural sort key, so that e.g. MS2 precedes MS10
+def natural_key(string):
+	return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', string)]
+
+# the minisymposia are numbered, they come as MS1, MS2, ..., MS10, then the YRMs
+@profile.timed('write_minis')
+def write_minis(organizers, MS, YRM, contributions, outdir, manifest=None):
+	inputs = []
+	for name, sessions in [*sorted(MS.items(), key=lambda item: natural_key(item[0])),
+						   *sorted(YRM.items(), key=lambda item: natural_key(item[0]))]:
+		fname = write_section(organizers, name, sessions, contributions, outdir,
+							  toc_sessions_silent=True, manifest=manifest)
+		inputs.append(f'\\input{{{fname}}}\n')
+	return ''.join(inputs)
+
+# every DFG session gets a section of its own
+@profile.timed('write_dfg')
+def write_dfg(organizers, blocks, contributions, outdir, manifest=None):
+	inputs = []
+	for sessions in blocks.values():
+		for row in session_records(sessions):
+			fname = write_section(organizers, row.session_short, sessions.loc[[row.label]], contributions, outdir,
+								  toc_sessions_silent=True, manifest=manifest)
+			inputs.append(f'\\input{{{fname}}}\n')
+	return ''.join(inputs)
 
 ################################################################################
 # routine for writing the tables in the daily session program                 #
 ################################################################################
-def make_session_table(sessionsAtTime, start, n, withMises=False):  # function used only in make_dsp
+# Slot grid of a time block: one row per session, one column per slot of
+# sessionlengths.default minutes. A cell holds the position of the contribution
+# starting in that slot in the list of the session's contributions, COVERED if
+# a longer contribution runs on through it, or EMPTY. Contributions are placed
+# in order at their offset, or right after an overlapping predecessor, and
+# cover as many slots as their duration, any multiple of the default length,
+# up to the end of the block. Sessions with contributions off the slot grid
+# (say 30 minute talks in 20 minute slots, as in some minisymposia) get None
+# instead of a row, and are set in a single cell spanning the block.
+EMPTY = -1
+COVERED = -2
+
+def slot_span(contribution, slot, n):
+	return min(max(1, contribution.duration // sessionlengths.default), n - slot)
+
+def slot_grid(sessions, contributions, n):
+	default = sessionlengths.default
+	grid = []
+	for session in sessions:
+		entries = contributions.get(session.label, [])
+		if any(c.offset % default or c.duration % default for c in entries):
+			grid.append(None)
+			continue
+		row = [EMPTY] * n
+		slot = 0
+		for k, contribution in enumerate(entries):
+			slot = max(slot, contribution.offset // default)
+			if slot >= n:
+				break
+			span = slot_span(contribution, slot, n)
+			row[slot:slot+span] = [k] + [COVERED] * (span - 1)
+			slot += span
+		grid.append(row)
+	return grid
+
+@profile.timed('make_session_table')
+def make_session_table(sessionsAtTime, contributions, start, n, withMises=False):  # function used only in make_dsp
 	
 	# translation reference:
 	#	BC → n=4
@@ -424,166 +664,217 @@ def make_session_table(sessionsAtTime, start, n, withMises=False):  # function u
 	#	t → n=1.5  // highlighted, use T
 	
 	column_sequence = ''.join(((f'X{getTableColWidth(n)}',f'Y{getTableColWidth(n)}')*-(-n//2))[:n])
-	inputs = f'\\begin{{longtable}}{{P{column_sequence}|}}\n'
+	inputs = [f'\\begin{{longtable}}{{P{column_sequence}|}}\n']
 	
-	inputs += r'    \rowcolor{primary}'
+	inputs.append(r'    \rowcolor{primary}')
 	for i in range(n):
 		slot_start = advance_slot(start, i, sessionlengths.default).strftime("%H:%M")
-		inputs += rf'& \raisebox{{-2pt}}{{\Large\bfseries\textcolor{{white}}{{{slot_start}}}}}'
-	inputs += '\\\\\n\\endhead\n'
-	skip = False
-	for _, session in sessionsAtTime.iterrows():
-		inputs += rf"\white{{\detokenize{{{session['session_short']}}}}}\newline\white{{\small\detokenize{{ ({session['session_room']})}}}}"
+		inputs.append(rf'& \raisebox{{-2pt}}{{\Large\bfseries\textcolor{{white}}{{{slot_start}}}}}')
+	inputs.append('\\\\\n\\endhead\n')
+	
+	# only title and presenter are shown, so the abstracts are not converted
+	placeholder = r'\footnotesize{\bfseries Price winner(s) and title(s) will be announced in the Opening}'
+	def infofield(session, contribution):
+		if session.session_short == 'RvML' and not withMises:
+			return placeholder
+		title = latexEscape(contribution.title)
+		return rf'\footnotesize{{\bfseries {title}}}\newline\presenter[{presenter_label(contribution)}]{{{presenter_name(contribution.presenter)}}}'
+	
+	sessions = session_records(sessionsAtTime)
+	for session, row in zip(sessions, slot_grid(sessions, contributions, n)):
+		inputs.append(rf"\white{{\detokenize{{{session.session_short}}}}}\newline\white{{\small\detokenize{{ ({session.session_room})}}}}")
 		
 		# This was added for EFDC, didn't exist in GAMM
-		inputs += rf"\newline\newline\white{{\small\detokenize{{{session['chair1_name']}}}}}"
+		inputs.append(rf"\newline\newline\white{{\small\detokenize{{{session.chair1_name}}}}}")
 		
-		j = 0 # j counts speakers/contributions in the session CSV
-		for i in range(n): # i counts fields in row
-			if skip:
-				skip = False
-				continue
-			
-			inputs += '\n&'  # allways add cell, even if no info in cell
-			
-			j += 1
-			contribution = get_contribution_info(session, j)
-			
-			if contribution is None:
-				if session['session_short'] == 'RvML':
-					inputs += r'\footnotesize{\bfseries Price winner(s) and title(s) will be announced in the Opening}'
-				
-				continue
-			
-			infofield = rf'\footnotesize{{\bfseries {contribution["title"]}}}\newline\presenter{{{contribution["presenter"]}}}'
-			
-			match contribution["duration"]:
-				case 60: # PLenary lectures (incl Prandtl)
-					inputs += infofield
-				case sessionlengths.double: # Topcial Speakers
-					skip = True # double length slot, so skip next time-slot in the loop
-					
-					inputs += f'\\multicolumn{{2}}{{T{getTableColWidth(n,2)}}}{{'  # double width field
-					inputs += infofield
-					inputs += f'}}'
-					
-				case sessionlengths.threeHalf: # either von Mises Lecture session with 2 talks or Minisymposium with 4 talks
-					print("MS",i,j)
-					if session['session_short'] == 'RvML':
-						if withMises:
-							inputs += infofield
-						else:
-							inputs += r'\footnotesize{\bfseries Price winner(s) and title(s) will be announced in the Opening}'
-					else:
-						noSlots = n*sessionlengths.default // sessionlengths.miniSymposium
-						
-						if i == 0:  # start
-							inputs += rf'\multicolumn{{{n}}}{{{getTableColWidth(n,n)}}}{{\noindent\begin{{tabularx}}{{\linewidth}}{{@{{}}BCBC@{{}}}}'
-						
-						inputs += infofield
-						
-						if i == noSlots-1:  # end
-							inputs += r'\end{tabularx}}'
-							break  # replaces drop_extra_empty, by doing the same functionally, behaves better if missing contrib in 4-ses-ms
-					
-				case sessionlengths.default: # the default 15 or 20 minutes section talks
-					shift = get_duration(advance_slot(start,i,sessionlengths.default).isoformat(), contribution["start"])
-					if shift > 0: # there is a gap in the schedule
-						j -= 1 # revisit contribution for next column
-					else:
-						inputs += infofield
-				
-				case _:
-					raise SystemExit('make_session_table: non-standard contribution length detected')
-		inputs += '\\\\\\hline\n'
-	inputs += '\\end{longtable}\n'
-	return utf8_clean(inputs)
-
-def make_postersession_table(sessionsAtTime, start):  # function used only in make_dsp
-	
-	inputs = f'\\begin{{longtable}}{{PX{getTableColWidth(1)}|}}\n'
-	
-	inputs += '    \\rowcolor{primary}'
-	inputs += f'&\\white{{{start.strftime("%H:%M")}}}'
-	inputs += '\\\\\n\\endhead\n'
-	for _, session in sessionsAtTime.iterrows():
-		sname = session['session_short']
-		sroom = session['session_room']
-		inputs += rf'\white{{\detokenize{{{sname}}}}}\newline\white{{\small\detokenize{{ ({sroom})}}}}'
-		for i in range(100): # just loop through enough entries of the session
-			
-			contribution = get_contribution_info(session, i)
-			if contribution is None:
-				continue
+		entries = contributions.get(session.label, [])
+		if row is None:  # off the slot grid, all contributions side by side in one cell
+			columns = ('BC' * len(entries))[:len(entries)]
+			inputs.append(f'\n&\\multicolumn{{{n}}}{{p{getTableColWidth(n,n)}}}{{\\noindent\\begin{{tabularx}}{{\\linewidth}}{{@{{}}{columns}@{{}}}}')
+			inputs.append('&'.join(infofield(session, contribution) for contribution in entries))
+			inputs.append(r'\end{tabularx}}')
+		else:
+			for i, k in enumerate(row):
+				if k == COVERED:
+					continue
+				inputs.append('\n&')  # allways add cell, even if no info in cell
+				if k == EMPTY:
+					if session.session_short == 'RvML':
+						inputs.append(placeholder)
+					continue
+				span = slot_span(entries[k], i, n)
+				if span == 1:
+					inputs.append(infofield(session, entries[k]))
+				else:  # e.g. topical speakers, highlighted
+					inputs.append(f'\\multicolumn{{{span}}}{{T{getTableColWidth(n,span)}}}{{')
+					inputs.append(infofield(session, entries[k]))
+					inputs.append('}')
+		inputs.append('\\\\\\hline\n')
+	inputs.append('\\end{longtable}\n')
+	return utf8_clean(''.join(inputs))
+
+@profile.timed('make_postersession_table')
+def make_postersession_table(sessionsAtTime, contributions, start):  # function used only in make_dsp
+	
+	inputs = [f'\\begin{{longtable}}{{PX{getTableColWidth(1)}|}}\n']
+	
+	inputs.append('    \\rowcolor{primary}')
+	inputs.append(f'&\\white{{{start.strftime("%H:%M")}}}')
+	inputs.append('\\\\\n\\endhead\n')
+	for session in session_records(sessionsAtTime):
+		sname = session.session_short
+		sroom = session.session_room
+		inputs.append(rf'\white{{\detokenize{{{sname}}}}}\newline\white{{\small\detokenize{{ ({sroom})}}}}')
+		for contribution in contributions.get(session.label, []):
+			contribution = get_contribution_info(session, contribution)
 			
-			inputs += '\n&'
-			inputs += rf'\footnotesize{{\bfseries {contribution["title"]}}}\newline\presenter{{{contribution["presenter"]}}}'
-			inputs += '\\\\\\hline\n'
+			inputs.append('\n&')
+			inputs.append(rf'\footnotesize{{\bfseries {contribution["title"]}}}\newline\presenter[{contribution["label"]}]{{{contribution["presenter"]}}}')
+			inputs.append('\\\\\\hline\n')
 			
-	inputs += '\\end{longtable}\n'
-	return utf8_clean(inputs)
+	inputs.append('\\end{longtable}\n')
+	return utf8_clean(''.join(inputs))
 
-def make_room_session_table(session, withMises=False, standalone=False):
+# session is a Session record, contributions the list of its contributions
+@profile.timed('make_room_session_table')
+def make_room_session_table(session, contributions, withMises=False, standalone=False):
 	
 	day = session.session_start.strftime("%A, %B %d")
 	stime = session.session_start.strftime("%H:%M")
 	etime = session.session_end.strftime("%H:%M")
 	
-	inputs = r"\small" +'\n'
+	inputs = [r"\small" +'\n']
 	if standalone:
-		inputs += fr'\fancyhead[D]{{\Large\bfseries {day}}}'
-		inputs += fr'\fancyhead[C]{{\Large\bfseries {session.session_room}}}'
-		inputs += fr'\fancyhead[R]{{\Large\bfseries {stime}--{etime}}}'
-		inputs += r"\begin{samepage}"
-		inputs += fr"\begin{{minipage}}{{0.22\textwidth}}\hfill \huge\bfseries\detokenize{{{session['session_short']}:}}\hspace*{{15pt}}\end{{minipage}}"
-		inputs += fr"\begin{{minipage}}{{0.78\textwidth}}\bfseries\large\detokenize{{{session['session_title']}}}\end{{minipage}}}}"
-		inputs += "\\vspace{10pt} \n\n"
-		inputs += fr"\begin{{minipage}}{{0.22\textwidth}}\hfill \large\detokenize{{Chair:}}\hspace*{{15pt}}\end{{minipage}}"
-		inputs += fr"\begin{{minipage}}{{0.78\textwidth}}\bfseries\large\detokenize{{{session['chair1_name']}}}\end{{minipage}}}}"
-		# inputs += fr"{{\large\bfseries\detokenize{{{session['chair1_name']}}}}}"
-		inputs += "\\vspace{20pt} \n\n"
+		inputs.append(fr'\fancyhead[D]{{\Large\bfseries {day}}}')
+		inputs.append(fr'\fancyhead[C]{{\Large\bfseries {session.session_room}}}')
+		inputs.append(fr'\fancyhead[R]{{\Large\bfseries {stime}--{etime}}}')
+		inputs.append(r"\begin{samepage}")
+		inputs.append(fr"\begin{{minipage}}{{0.22\textwidth}}\hfill \huge\bfseries\detokenize{{{session.session_short}:}}\hspace*{{15pt}}\end{{minipage}}")
+		inputs.append(fr"\begin{{minipage}}{{0.78\textwidth}}\bfseries\large\detokenize{{{session.session_title}}}\end{{minipage}}}}")
+		inputs.append("\\vspace{10pt} \n\n")
+		inputs.append(fr"\begin{{minipage}}{{0.22\textwidth}}\hfill \large\detokenize{{Chair:}}\hspace*{{15pt}}\end{{minipage}}")
+		inputs.append(fr"\begin{{minipage}}{{0.78\textwidth}}\bfseries\large\detokenize{{{session.chair1_name}}}\end{{minipage}}}}")
+		# inputs += fr"{{\large\bfseries\detokenize{{{session.chair1_name}}}}}"
+		inputs.append("\\vspace{20pt} \n\n")
 	else:
-		inputs += f'\n\\begin{{samepage}}\n\\section*{{{day}\\hfill{stime}--{etime}}}\n'
-		inputs += f"\n\\begin{{center}}\\huge\\bfseries\\detokenize{{{session['session_short']}}}\\end{{center}}\n"
-	inputs += '\\begin{tabularx}{\\linewidth}{|A|B|}\n\\hline\n'
-	for i in range(99):
-		contribution = get_contribution_info(session, i)
-		
-		if session['session_short'] == 'RvML' and i == 1 and (contribution is None or not withMises):
-			cstart = session.session_start.strftime("%H:%M")
-			inputs += f'{cstart}&\n'
-			inputs += r'\textbf{Price winner(s) and title(s) will be announced in the Opening}\\ \hline' +'\n'
-			continue
-		
+		inputs.append(f'\n\\begin{{samepage}}\n\\section*{{{day}\\hfill{stime}--{etime}}}\n')
+		inputs.append(f"\n\\begin{{center}}\\huge\\bfseries\\detokenize{{{session.session_short}}}\\end{{center}}\n")
+	inputs.append('\\begin{tabularx}{\\linewidth}{|A|B|}\n\\hline\n')
+	# the first von Mises lecture is replaced by a placeholder until announced
+	entries = contributions
+	if session.session_short == 'RvML':
+		entries = [c for c in entries if c.idx != 1 or withMises]
+		if not any(c.idx == 1 for c in entries):
+			entries = sorted(entries + [None], key=lambda c: 1 if c is None else c.idx)
+	for contribution in entries:
 		if contribution is None:
+			cstart = stime
+			inputs.append(f'{cstart}&\n')
+			inputs.append(r'\textbf{Price winner(s) and title(s) will be announced in the Opening}\\ \hline' +'\n')
 			continue
 		
+		contribution = get_contribution_info(session, contribution)
 		if contribution["duration"] == 0: # set explicitly for posters
-			cstart = session.session_start.strftime("%H:%M")
+			cstart = stime
 		else:
-			cstart = dt.datetime.fromisoformat(contribution["start"]).strftime("%H:%M")
-		inputs += f'{cstart}&\n'
+			cstart = contribution["start"].strftime("%H:%M")
+		inputs.append(f'{cstart}&\n')
 		if standalone:
-			inputs += rf'\footnotesize\textbf{{{contribution["title"]}}}'
+			inputs.append(rf'\footnotesize\textbf{{{contribution["title"]}}}')
 			# authors = re.sub(r'\s*\((\d+(?:,\d+)*)\)', r'$^\\textbf{\\footnotesize \,\g<1>}$', contribution["authors"])
 			authors = re.sub(r'\s*\((\d+(?:,\d+)*)\)', '', contribution["authors"])
-			inputs += rf'\vspace{{2pt}} \newline {{{authors}}}'
+			inputs.append(rf'\vspace{{2pt}} \newline {{{authors}}}')
 			# orgas = re.sub(r'(^|;\s*)(\d+):\s*', r'\g<1>$^\\textbf{\\scriptsize \g<2>}$', contribution["organizations"])
 			# inputs += rf'\vspace{{5pt}} \newline \scriptsize{{{orgas}}}'
 		else:
-			inputs += rf'\textbf{{{contribution["title"]}}}\newline\textit{{{contribution["presenter"]}}}'
-		inputs += r"\\ \hline" +'\n'
+			inputs.append(rf'\textbf{{{contribution["title"]}}}\newline\textit{{{contribution["presenter"]}}}')
+		inputs.append(r"\\ \hline" +'\n')
+
+	inputs.append('\\end{tabularx}\n\\end{samepage}\n')
+
+	return utf8_clean(''.join(inputs))
+
+# The room and day plans are rendered in worker processes. Instead of pandas
+# objects, the workers get compact batches: per session its Session record
+# and the list of its contributions.
+def session_batch(sessions, contributions):
+	return [(session, contributions.get(session.label, [])) for session in session_records(sessions)]
+
+def render_session_tables(batch, withMises, standalone):
+	return [make_room_session_table(session, entries, withMises=withMises, standalone=standalone)
+			for session, entries in batch]
+
+# render the batches of the given plans, tuples ending in a batch, in the pool,
+# if any. Every plan is submitted as soon as it is taken from plans and yielded
+# with its tables once those are done, in order, so the first files can be
+# written while later plans are still being checked against the manifest.
+def render_batches(plans, withMises, standalone, pool=None):
+	if pool is None:
+		for plan in plans:
+			yield plan, render_session_tables(plan[-1], withMises, standalone)
+		return
+	pending = deque()
+	for plan in plans:
+		pending.append((plan, pool.submit(render_session_tables, plan[-1], withMises, standalone)))
+		while pending and pending[0][1].done():
+			plan, future = pending.popleft()
+			yield plan, future.result()
+	for plan, future in pending:
+		yield plan, future.result()
+
+################################################################################
+# The speaker indices of the BoA and DSP are written here instead of by        #
+# makeindex: every \presenter carries the label of its contribution, and the   #
+# .ind file lists per speaker the labels, whose pages the classes look up.     #
+# Sorting ignores accents and case, so Ödegaard goes with the O and not after  #
+# the Z, and speakers are merged by name regardless of spacing and case.       #
+################################################################################
+collation_map = str.maketrans({'ß': 'ss', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE', 'ø': 'o', 'Ø': 'O',
+							   'đ': 'd', 'Đ': 'D', 'ł': 'l', 'Ł': 'L', 'þ': 'th', 'Þ': 'TH', 'ı': 'i'})
+
+def collation_key(name):
+	base = unicodedata.normalize('NFKD', name.translate(collation_map))
+	base = ''.join(char for char in base if not unicodedata.combining(char)).casefold()
+	return base, name.casefold(), name
+
+# (name, label) of the speakers of the sessions in document order, shown
+# selects the contributions of a session that appear in the document
+def speakers(sessions, contributions, shown=lambda entries: entries):
+	return [(presenter_name(contribution.presenter), presenter_label(contribution))
+			for row in session_records(sessions) for contribution in shown(contributions.get(row.label, []))]
+
+# sorted list of (name, labels), one entry per speaker
+def speaker_index(speakers):
+	names = {}
+	labels = {}
+	for name, label in speakers:
+		name = ' '.join(name.split())
+		key = unicodedata.normalize('NFC', name).casefold()
+		names.setdefault(key, name)
+		labels.setdefault(key, []).append(label)
+	return sorted(((names[key], labels[key]) for key in names), key=lambda entry: collation_key(entry[0]))
 
-	inputs += '\\end{tabularx}\n\\end{samepage}\n'
+@profile.timed('write_speaker_index')
+def write_speaker_index(fname, speakers, manifest=None):
+	index = speaker_index(speakers)
+	with TexWriter(fname, manifest, (index,)) as out:
+		group = None
+		for name, labels in index:
+			initial = collation_key(name)[0][:1]
+			if group is not None and initial != group:
+				out.write('\n\\indexspace\n\n', clean=False)
+			group = initial
+			out.write(f'\\IndexEntry{{{name}}}{{{",".join(labels)}}}\n')
 
-	return utf8_clean(inputs)
 ################################################################################
 # top-level routines for generating the book of abstracts and daily session    #
 # program                                                                      #
 ################################################################################
-def make_boa(df, withMises):
+@profile.timed('make_boa')
+def make_boa(df, contributions, withMises, manifest=None, chunks=False):
 	# Filter by the categories desired as chapter in the BoA
-	getSessions = lambda acronym: df[df['session_short'].str.startswith(acronym)].sort_values(by='session_short')
+	blocks = index_blocks(df)
+	getSessions = lambda acronym: select_blocks(blocks, acronym)
 	
 	# EFDC change: new session acronyms
 	# DFG              = getSessions('DFG')
@@ -609,21 +900,39 @@ def make_boa(df, withMises):
 	# Organizers = Organizers[Organizers.track_type.notnull()].sort_values(by='track_type')  # EFDC change - track_type does not exist
 
 	outdir  = './LaTeX/Book_of_abstracts/Sessions/'
-	inputs  = '\\chapter{Prandtl Memorial Lecture and Plenary~Lectures}\n'
-	inputs += write_PML(Prandtl, outdir)
-	inputs += write_PL(Plenaries, outdir)
+	chapters = [('Prandtl Memorial Lecture and Plenary~Lectures',
+				 write_PML(join_blocks(Prandtl, df.columns), contributions, outdir, manifest)
+				 + write_PL(join_blocks(Plenaries, df.columns), contributions, outdir, manifest))]
 	if withMises:
-		vonMises = df[df['session_short'].str.startswith('RvML')].sort_values(by='session_short')
-		inputs  += '\\chapter{Richard von Mises Price Lecture(s)}\n'
-		inputs  += write_RvML(vonMises, outdir)
-	inputs += '\\chapter{Minisymposia and Young~Researchers~Minisymposia}\n'
-	inputs += write_minis(Organizers, Minisymposia, YoungResearchers, outdir)
-	inputs += '\\chapter{DFG Programs}\n'
-	inputs += write_dfg(Organizers, DFG, outdir)
-	inputs += '\\chapter{Contributed Sessions}\n'
-	inputs += write_sections(Organizers, Contributed, outdir)
-
-	boa = open('./LaTeX/Book_of_abstracts/BookOfAbstracts.tex', 'w', encoding = 'utf-8')
+		vonMises = join_blocks(getSessions('RvML'), df.columns)
+		chapters.append(('Richard von Mises Price Lecture(s)',
+						 write_RvML(vonMises, contributions, outdir, manifest)))
+	chapters.append(('Minisymposia and Young~Researchers~Minisymposia',
+					 write_minis(Organizers, Minisymposia, YoungResearchers, contributions, outdir, manifest)))
+	chapters.append(('DFG Programs',
+					 write_dfg(Organizers, DFG, contributions, outdir, manifest)))
+	chapters.append(('Contributed Sessions',
+					 write_sections(Organizers, Contributed, contributions, outdir, manifest)))
+	
+	# the speakers in the order of the chapters, of the sections only those
+	# marked among the authors
+	first = lambda entries: entries[:1]
+	marked = lambda entries: [c for c in entries if c.presenter in c.authors]
+	index = (speakers(join_blocks(Prandtl, df.columns), contributions, first)
+			 + speakers(join_blocks(Plenaries, df.columns), contributions, first))
+	if withMises:
+		index += speakers(vonMises, contributions, lambda entries: [c for c in entries if c.idx in (1, 2)])
+	for blocks in (Minisymposia, YoungResearchers, DFG, Contributed):
+		for sessions in blocks.values():
+			index += speakers(sessions, contributions, marked)
+	write_speaker_index('./LaTeX/Book_of_abstracts/BookOfAbstracts.ind', index, manifest)
+	
+	if chunks:
+		chunks = write_boa_chunks(chapters, manifest)
+		if manifest is not None:
+			manifest.prune('./LaTeX/Book_of_abstracts/')
+		return chunks
+
 	contents = r'''\nonstopmode
 \documentclass[colorlinks]{gamm-boa}
 
@@ -633,33 +942,67 @@ CONTENTS
 \printindex
 \end{document}
 '''
-	contents = contents.replace('CONTENTS', inputs)
-	boa.write(contents)
-	boa.close()
+	contents = contents.replace('CONTENTS', ''.join(f'\\chapter{{{title}}}\n{inputs}' for title, inputs in chapters))
+	with TexWriter('./LaTeX/Book_of_abstracts/BookOfAbstracts.tex', manifest, (contents,)) as boa:
+		boa.write(contents, clean=False)
+	if manifest is not None:
+		manifest.prune('./LaTeX/Book_of_abstracts/')
 
-def make_dsp(sessions, withMises):
+# For the chunked build of RunMe.py every chapter of the BoA becomes a document
+# of its own, BookOfAbstracts-<n>.tex, without title pages, starting at the
+# page given in BookOfAbstracts-<n>.offset. BookOfAbstracts.tex then only holds
+# the title pages, the table of contents and the speaker labels merged from the
+# chapters by RunMe.py and the index, and includes the PDFs of the chapters.
+# Links inside the chapter PDFs do not survive \includepdf, the outline is
+# rebuilt from the bookmarks written by RunMe.py. The names of the chapter
+# documents are returned.
+def write_boa_chunks(chapters, manifest=None):
+	chunk_template = r'''\nonstopmode
+\documentclass[colorlinks]{gamm-boa}
+\csname endofdump\endcsname
+\renewcommand{\maketitle}{}
+\begin{document}
+\setcounter{chapter}{NUMBER}
+\InputIfFileExists{\jobname.offset}{}{}
+\chapter{TITLE}
+CONTENTS
+\end{document}
+'''
+	chunks = []
+	for i, (title, inputs) in enumerate(chapters):
+		fname = f'BookOfAbstracts-{i + 1}.tex'
+		contents = chunk_template.replace('NUMBER', str(i)).replace('TITLE', title).replace('CONTENTS', inputs)
+		with TexWriter(f'./LaTeX/Book_of_abstracts/{fname}', manifest, (contents,)) as chunk:
+			chunk.write(contents, clean=False)
+		chunks.append(fname)
+	
+	contents = r'''\nonstopmode
+\documentclass[colorlinks]{gamm-boa}
+\csname endofdump\endcsname
+\usepackage{pdfpages}
+\usepackage{bookmark}
+
+\begin{document}
+\tableofcontentsfrom{\jobname.chunks.toc}
+\clearpage
+\typeout{boa-chunks-start=\thepage}
+CONTENTS
+\makeatletter
+\InputIfFileExists{\jobname.chunks.labels}{}{}
+\makeatother
+\printindex
+\InputIfFileExists{\jobname.chunks.bookmarks}{}{}
+\end{document}
+'''
+	contents = contents.replace('CONTENTS', ''.join(f'\\includepdf[pages=-]{{{os.path.splitext(fname)[0]}}}\n'
+													for fname in chunks))
+	with TexWriter('./LaTeX/Book_of_abstracts/BookOfAbstracts.tex', manifest, (contents,)) as boa:
+		boa.write(contents, clean=False)
+	return chunks
+
+@profile.timed('make_dsp')
+def make_dsp(sessions, contributions, withMises, manifest=None):
 	
-	# iterate over bunches of sessions starting at the same time
-	inputs = ''
-	old_day = None
-	sessions = sessions.sort_values(['session_start','session_short'])
-	for start, sessionsAtTime in sessions.groupby('session_start'):
-		
-		day = start.strftime("%A, %B %d")
-		if old_day != day:
-			old_day = day
-			inputs += f'\\chapter{{{day}}}\n'
-		#inputs += f'\\section*{{{start.strftime("%H:%M")}}}\n'
-		length = get_ses_length(sessionsAtTime.iloc[0])
-		if len(sessionsAtTime) == 1:
-			if sessionsAtTime['session_short'].values[0].startswith('Poster'):
-				inputs += make_postersession_table(sessionsAtTime, start)
-			else:
-				inputs += make_session_table(sessionsAtTime, start, 1, withMises=withMises)
-		else:
-			num_slots = length // sessionlengths.default
-			inputs += make_session_table(sessionsAtTime, start, num_slots, withMises=withMises)
-			# inputs += make_postersession_table(sessionsAtTime, start)
 	contents = r'''\nonstopmode
 		\documentclass[colorlinks]{gamm-dsp}
 		
@@ -671,49 +1014,90 @@ def make_dsp(sessions, withMises):
 		\printindex
 		\end{document}
 	'''
-	contents = contents.replace('CONTENTS', inputs)
-	with open('./LaTeX/Daily_Scientific_Program/Daily_Scientific_Program.tex', 'w') as dsp:
-		dsp.write(contents)
+	head, tail = contents.split('CONTENTS')
+	
+	# the von Mises lectures are only shown once announced
+	sessions = sessions.sort_values(['session_start','session_short'])
+	shown = sessions if withMises else sessions[sessions['session_short'] != 'RvML']
+	write_speaker_index('./LaTeX/Daily_Scientific_Program/Daily_Scientific_Program.ind',
+						speakers(shown, contributions), manifest)
+	
+	with TexWriter('./LaTeX/Daily_Scientific_Program/Daily_Scientific_Program.tex',
+				   manifest, (schedule_columns(sessions), withMises)) as dsp:
+		if dsp.unchanged:
+			return
+		dsp.write(head, clean=False)
+		
+		# iterate over bunches of sessions starting at the same time
+		old_day = None
+		for start, sessionsAtTime in sessions.groupby('session_start'):
+			
+			day = start.strftime("%A, %B %d")
+			if old_day != day:
+				old_day = day
+				dsp.write(f'\\chapter{{{day}}}\n', clean=False)
+			#dsp.write(f'\\section*{{{start.strftime("%H:%M")}}}\n', clean=False)
+			length = get_ses_length(sessionsAtTime.iloc[0])
+			if len(sessionsAtTime) == 1:
+				if sessionsAtTime['session_short'].values[0].startswith('Poster'):
+					table = make_postersession_table(sessionsAtTime, contributions, start)
+				else:
+					table = make_session_table(sessionsAtTime, contributions, start, 1, withMises=withMises)
+			else:
+				num_slots = length // sessionlengths.default
+				table = make_session_table(sessionsAtTime, contributions, start, num_slots, withMises=withMises)
+				# table = make_postersession_table(sessionsAtTime, contributions, start)
+			dsp.write(table, clean=False)  # the tables are already cleaned
+		
+		dsp.write(tail, clean=False)
 
-def make_room_plans(sessions, withMises):
+# done is called with the name of every room plan once the file is complete.
+# The tables are rendered in the process pool, if given, one batch per room.
+@profile.timed('make_room_plans')
+def make_room_plans(sessions, contributions, withMises, manifest=None, done=None, pool=None):
 	outdir = './LaTeX/Daily_Scientific_Program/rooms/'
 	
 	with open('./LaTeX/Daily_Scientific_Program/room_template.tex', 'r') as template_file:
 		template = template_file.read()
 	
 	sessions = sessions.sort_values(['session_room','session_start'])
-	for room, roomsessions in sessions.groupby('session_room'):
-		print(f'Generating room: {room}\n')
-		room = room.replace('/', '-')
-		old_day = ''
-		inputs = ''
-		for _, row in roomsessions.iterrows():
-			day = row['session_start'].strftime("%A, %B %d")
-			if old_day != day:
-				old_day = day
-				inputs += '\n\\pagebreak[4]'
-			inputs += make_room_session_table(row, withMises=withMises)
-		contents = template.replace('ROOM', room)
-		contents = contents.replace('CONTENTS', inputs)
-		
-		with open(f'{outdir}{room}.tex', 'w') as room_file:
-			room_file.write(contents)
+	def rooms():
+		for room, roomsessions in sessions.groupby('session_room', observed=True):
+			print(f'Generating room: {room}\n')
+			room = room.replace('/', '-')
+			fname = f'{outdir}{room}.tex'
+			if manifest is not None and manifest.current(fname, schedule_columns(roomsessions), template, withMises):
+				if done is not None:
+					done(fname)
+				continue
+			yield room, fname, session_batch(roomsessions, contributions)
+	
+	for (room, fname, batch), roomtables in render_batches(rooms(), withMises, False, pool):
+		head, tail = template.replace('ROOM', room).split('CONTENTS')
+		with TexWriter(fname) as room_file:
+			room_file.write(head, clean=False)
+			old_day = ''
+			for (session, _), table in zip(batch, roomtables):
+				day = session.session_start.strftime("%A, %B %d")
+				if old_day != day:
+					old_day = day
+					room_file.write('\n\\pagebreak[4]', clean=False)
+				room_file.write(table, clean=False)
+			room_file.write(tail, clean=False)
+		if manifest is not None:
+			manifest.record(fname)
+		if done is not None:
+			done(fname)
+	if manifest is not None:
+		manifest.prune(outdir)
 
-def make_session_plans(sessions, withMises):
+# done is called with the name of every day plan once the file is complete.
+# The tables are rendered in the process pool, if given, one batch per day.
+@profile.timed('make_session_plans')
+def make_session_plans(sessions, contributions, withMises, manifest=None, done=None, pool=None):
 	outdir = './LaTeX/Daily_Scientific_Program/days/'
 	
-	days = {}
-	
-	sessions = sessions.sort_values(['session_start','session_room'])
-	for _, session in sessions.iterrows():
-		day = session.session_start.strftime("%A, %B %d")
-		
-		if day not in days:
-			days[day] = []
-		days[day].append( make_room_session_table(session, withMises=withMises, standalone=True) )
-	
-	for day, dayTexs in days.items():
-		contents = r"""
+	day_template = r"""
 			\documentclass{article}
 			
 			% \usepackage[a3paper,margin=2cm]{geometry}
@@ -736,7 +1120,7 @@ def make_session_plans(sessions, withMises):
 			\setlength{\arrayrulewidth}{1pt}
 			\renewcommand{\arraystretch}{1.5}
 			
-			\newcommand{\presenter}[1]{\underline{#1}}
+			\newcommand{\presenter}[2][]{\underline{#2}}
 			
 			\begin{document}
 			
@@ -749,13 +1133,390 @@ def make_session_plans(sessions, withMises):
 			%%% TeX-master: t
 			%%% End:
 		"""
-		if day in ["Monday, September 16","Friday, September 20"]:
-			contents = contents.replace('a4paper,landscape', 'a3paper,portrait' )
-		print(f"day: printed {len(dayTexs)} sessions on at least as many pages")
-		contents = contents.replace('CONTENTS', '\n\\pagebreak[4]'.join(dayTexs) )
-		with open(f'{outdir}{day}.tex', 'w') as day_file:
-			day_file.write(contents)
+	
+	# sessions are sorted by start, so the days come in chronological order
+	sessions = sessions.sort_values(['session_start','session_room'])
+	days = sessions['session_start'].dt.strftime("%A, %B %d")
+	def plans():
+		for day, daysessions in sessions.groupby(days, sort=False):
+			contents = day_template
+			if day in ["Monday, September 16","Friday, September 20"]:
+				contents = contents.replace('a4paper,landscape', 'a3paper,portrait' )
+			fname = f'{outdir}{day}.tex'
+			if manifest is not None and manifest.current(fname, schedule_columns(daysessions), contents, withMises):
+				if done is not None:
+					done(fname)
+				continue
+			yield contents, fname, session_batch(daysessions, contributions)
+	
+	for (contents, fname, batch), daytables in render_batches(plans(), withMises, True, pool):
+		head, tail = contents.split('CONTENTS')
+		with TexWriter(fname) as day_file:
+			day_file.write(head, clean=False)
+			day_file.write('\n\\pagebreak[4]'.join(daytables), clean=False)
+			day_file.write(tail, clean=False)
+		if manifest is not None:
+			manifest.record(fname)
+		print(f"day: printed {len(batch)} sessions on at least as many pages")
+		if done is not None:
+			done(fname)
+	if manifest is not None:
+		manifest.prune(outdir)
+
+
+################################################################################
+# HTML and JSON program: the schedule of the DSP and of the room and day plans #
+# as static web pages, one per day and one per room, and as program.json. No   #
+# TeX run is needed, so schedule changes can be checked within a second, and   #
+# the pages can be published as they are. Every session is rendered once and   #
+# the snippet is shared by its day and room page.                              #
+################################################################################
+html_outdir = './HTML/'
+
+html_style = '''body { font-family: "Open Sans", sans-serif; margin: 2em auto; max-width: 60em; }
+nav a { margin-right: 1em; }
+h2 { border-bottom: 2px solid #1f4e79; }
+.session { margin: 0 0 1.5em 0; }
+.session h3 { margin-bottom: 0.2em; }
+.session .short { color: #1f4e79; }
+.session .info { margin: 0; color: #555; }
+.talks { list-style: none; padding-left: 0; }
+.talks li { margin: 0.3em 0; }
+.talks time { display: inline-block; width: 4em; font-weight: bold; }
+.talks .title { font-weight: bold; }
+.talks .presenter { text-decoration: underline; }
+'''
+
+html_template = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>TITLE</title>
+<link rel="stylesheet" href="ROOTprogram.css">
+</head>
+<body>
+<nav><a href="ROOTindex.html">Program</a><a href="ROOTprogram.json">JSON</a></nav>
+<h1>TITLE</h1>
+CONTENTS
+</body>
+</html>
+'''
+
+def html_page(fname, title, contents, root='../'):
+	head, tail = html_template.replace('ROOT', root).replace('TITLE', escape(title)).split('CONTENTS')
+	with open(fname, 'w', encoding='utf-8') as f:
+		f.write(head)
+		f.write(contents)
+		f.write(tail)
+
+def html_slug(name):
+	return re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-')
+
+# missing values of the exports become null in the JSON dump
+def json_text(value):
+	return None if pd.isna(value) else str(value)
+
+def json_time(value):
+	return None if pd.isna(value) else value.isoformat(timespec='minutes')
+
+# the von Mises lectures are withheld until announced in the opening
+def announced(session, entries, withMises):
+	return withMises or session.session_short != 'RvML'
+
+def session_json(session, entries, withMises):
+	shown = announced(session, entries, withMises)
+	return {
+		'short'         : session.session_short,
+		'title'         : json_text(session.session_title),
+		'room'          : json_text(session.session_room),
+		'start'         : json_time(session.session_start),
+		'end'           : json_time(session.session_end),
+		'chairs'        : [chair for chair in session.chairs if chair != 'nan'],
+		'contributions' : [{
+			'idx'           : int(c.idx),
+			'title'         : json_text(c.title),
+			'authors'       : json_text(c.authors),
+			'presenter'     : presenter_name(c.presenter),
+			'organisations' : json_text(c.organisations),
+			'start'         : json_time(c.start),
+			'end'           : json_time(c.end),
+			'duration'      : int(c.duration),
+		} for c in entries] if shown else [],
+	}
 
+def session_html(session, entries, withMises):
+	chairs = ', '.join(escape(chair) for chair in session.chairs if chair != 'nan')
+	html = [f'<section class="session" id="{html_slug(session.session_short)}">\n',
+			f'<h3><span class="short">{escape(session.session_short)}</span> {escape(str(session.session_title))}</h3>\n',
+			f'<p class="info">{session.session_start.strftime("%H:%M")}&ndash;{session.session_end.strftime("%H:%M")}, ',
+			escape(str(session.session_room)),
+			f'; Chair: {chairs}' if chairs else '',
+			'</p>\n<ol class="talks">\n']
+	if not announced(session, entries, withMises):
+		html.append('<li>Price winner(s) and title(s) will be announced in the Opening</li>\n')
+		entries = []
+	for c in entries:
+		start = '' if c.duration == 0 or pd.isna(c.start) else c.start.strftime('%H:%M')
+		html.append(f'<li><time>{start}</time> <span class="title">{escape(str(c.title))}</span> '
+					f'<span class="presenter">{escape(presenter_name(c.presenter))}</span></li>\n')
+	html.append('</ol>\n</section>\n')
+	return ''.join(html)
+
+@profile.timed('make_html')
+def make_html(sessions, contributions, withMises, outdir=html_outdir):
+	for subdir in ('days', 'rooms'):
+		os.makedirs(outdir + subdir, exist_ok=True)
+		for fname in glob(outdir + subdir + '/*.html'):
+			os.remove(fname)  # pages of days and rooms no longer in the program
+	
+	records = session_records(sessions.sort_values(['session_start','session_short']))
+	rendered = {session.label: session_html(session, contributions.get(session.label, []), withMises)
+				for session in records}
+	
+	days = {}
+	for session in records:
+		days.setdefault(session.session_start.strftime('%A, %B %d'), []).append(session)
+	for day, daysessions in days.items():
+		contents = []
+		start = None
+		for session in daysessions:
+			if session.session_start != start:
+				start = session.session_start
+				contents.append(f'<h2>{start.strftime("%H:%M")}</h2>\n')
+			contents.append(rendered[session.label])
+		html_page(f'{outdir}days/{html_slug(day)}.html', day, ''.join(contents))
+	
+	rooms = {}
+	for session in sorted(records, key=lambda session: (str(session.session_room), session.session_start)):
+		rooms.setdefault(str(session.session_room), []).append(session)
+	for room, roomsessions in rooms.items():
+		contents = []
+		old_day = None
+		for session in roomsessions:
+			day = session.session_start.strftime('%A, %B %d')
+			if old_day != day:
+				old_day = day
+				contents.append(f'<h2>{day}</h2>\n')
+			contents.append(rendered[session.label])
+		html_page(f'{outdir}rooms/{html_slug(room)}.html', room, ''.join(contents))
+	
+	index = ['<h2>Days</h2>\n<ul>\n',
+			 *(f'<li><a href="days/{html_slug(day)}.html">{escape(day)}</a></li>\n' for day in days),
+			 '</ul>\n<h2>Rooms</h2>\n<ul>\n',
+			 *(f'<li><a href="rooms/{html_slug(room)}.html">{escape(room)}</a></li>\n' for room in rooms),
+			 '</ul>\n']
+	html_page(outdir + 'index.html', 'Program', ''.join(index), root='')
+	with open(outdir + 'program.css', 'w', encoding='utf-8') as f:
+		f.write(html_style)
+	
+	program = {'withMises': withMises,
+			   'sessions': [session_json(session, contributions.get(session.label, []), withMises) for session in records]}
+	with open(outdir + 'program.json', 'w', encoding='utf-8') as f:
+		f.write(json.dumps(program, ensure_ascii=False))  # compact, so the C encoder is used
+	print(f'HTML program: {len(records)} sessions on {len(days)} day and {len(rooms)} room pages')
+
+
+################################################################################
+# loading the sessions exported from ConfTool. Parsing the wide CSV is slow,   #
+# so the typed DataFrame is cached next to it, keyed on the hash of the CSV    #
+################################################################################
+def read_sessions_csv(fname):
+	sessions = pd.read_csv(fname, sep=';', quotechar='"')
+	sessions['session_start'] = pd.to_datetime(sessions['session_start'])
+	sessions['session_end'] = pd.to_datetime(sessions['session_end'])
+	for col in sessions.columns:
+		if re.fullmatch(r'p\d+_(start|end)', col):
+			sessions[col] = pd.to_datetime(sessions[col])
+	sessions['session_short'] = sessions['session_short'].astype('category')
+	sessions['session_room'] = sessions['session_room'].astype('category')
+	return sessions
+
+@profile.timed('load')
+def load_sessions(fname='CSV/sessions.csv', use_cache=True):
+	if not use_cache:
+		return read_sessions_csv(fname)
+	
+	with open(fname, 'rb') as f:
+		digest = hashlib.sha256(f.read() + cache_version).hexdigest()[:16]
+	base = os.path.splitext(fname)[0]
+	cache = f'{base}.{digest}.{cache_format}'
+	
+	if os.path.exists(cache):
+		if cache_format == 'parquet':
+			return pd.read_parquet(cache)
+		return pd.read_pickle(cache)
+	
+	sessions = read_sessions_csv(fname)
+	for stale in glob(f'{base}.*.parquet') + glob(f'{base}.*.pkl'):
+		os.remove(stale)
+	if cache_format == 'parquet':
+		sessions.to_parquet(cache)
+	else:
+		sessions.to_pickle(cache)
+	return sessions
+
+# the sessions that were added, removed or modified from old to new, taken from
+# both tables, so the rooms and days they were and are scheduled in can be
+# looked up. Sessions are identified by their short title.
+def changed_sessions(old, new):
+	if list(old.columns) != list(new.columns):
+		return pd.concat([old, new])
+	row_hashes = lambda sessions: pd.Series(pd.util.hash_pandas_object(sessions, index=False).to_numpy(),
+											index=sessions['session_short'].astype(str).to_numpy())
+	old_hashes = row_hashes(old)
+	new_hashes = row_hashes(new)
+	old_changed = ~old_hashes.index.isin(new_hashes.index) | ~old_hashes.isin(new_hashes.to_numpy()).to_numpy()
+	new_changed = ~new_hashes.index.isin(old_hashes.index) | ~new_hashes.isin(old_hashes.to_numpy()).to_numpy()
+	return pd.concat([old[old_changed], new[new_changed]])
+
+################################################################################
+# ConfTool exports the contributions of a session as the columns p1_title,     #
+# p1_authors, ..., p99_end of the session's row. The wide and sparse layout is #
+# melted once into a long table holding one row per existing contribution.     #
+################################################################################
+contribution_columns = {
+	'title'             : 'title',
+	'authors'           : 'authors',
+	'presenting_author' : 'presenter',
+	'start'             : 'start',
+	'end'               : 'end',
+	'abstract'          : 'abstract',
+	'organisations'     : 'organisations',
+}
+
+@profile.timed('melt_contributions')
+def melt_contributions(sessions):
+	indices = sorted(int(m.group(1)) for col in sessions.columns
+					 if (m := re.fullmatch(r'p(\d+)_title', col)))
+	parts = []
+	for idx in indices:
+		columns = {f'p{idx}_{field}': name for field, name in contribution_columns.items()
+				   if f'p{idx}_{field}' in sessions.columns}
+		part = sessions[['session_short', 'session_start', *columns]].rename(columns=columns)
+		part.insert(0, 'session', sessions.index)
+		part.insert(2, 'idx', idx)
+		parts.append(part)
+	contributions = pd.concat(parts, ignore_index=True)
+	contributions = contributions.reindex(columns=['session', 'session_short', 'session_start',
+												   'idx', *contribution_columns.values()])
+	
+	# only contributions with a presenter actually exist
+	contributions = contributions[contributions['presenter'].notna()]
+	contributions = contributions.sort_values(['session', 'idx'], kind='stable')
+	
+	# duration and offset from the start of the session in minutes, posters
+	# have no duration
+	minutes = lambda delta: (delta.dt.total_seconds() // 60).fillna(0).astype(int)
+	duration = minutes(contributions['end'] - contributions['start'])
+	duration[contributions['session_short'].astype(str).str.startswith('Poster')] = 0
+	contributions['duration'] = duration
+	contributions['offset'] = minutes(contributions['start'] - contributions['session_start'])
+	return contributions.drop(columns='session_start').reset_index(drop=True)
+
+################################################################################
+# The writers do not iterate over pandas rows, but over compact records built  #
+# with itertuples: a Session per session row, holding only the fields used in  #
+# the documents, and a Contribution per row of the contributions table.        #
+################################################################################
+class Session(NamedTuple):
+	label: object  # index label of the row in the sessions table
+	session_short: str
+	session_title: str
+	session_room: str
+	session_start: pd.Timestamp
+	session_end: pd.Timestamp
+	chair1: object
+	chair1_name: object
+	chairs: tuple  # all chair0 ... chair9 columns present, as strings
+
+class Contribution(NamedTuple):
+	session: object  # index label of the session
+	session_short: str
+	idx: int
+	title: str
+	authors: str
+	presenter: str
+	start: pd.Timestamp
+	end: pd.Timestamp
+	abstract: object
+	organisations: object
+	duration: int
+	offset: int
+
+session_fields = ['session_short', 'session_title', 'session_room', 'session_start', 'session_end', 'chair1_name']
+
+def session_records(sessions):
+	chair_columns = [f'chair{i}' for i in range(10) if f'chair{i}' in sessions.columns]
+	frame = sessions.reindex(columns=session_fields + chair_columns)
+	n = len(session_fields)
+	chair1 = chair_columns.index('chair1') if 'chair1' in chair_columns else None
+	records = []
+	for label, *values in frame.itertuples(name=None):
+		chairs = values[n:]
+		records.append(Session(label, *values[:n-1], float('nan') if chair1 is None else chairs[chair1],
+							   values[n-1], tuple(str(chair) for chair in chairs)))
+	return records
+
+# map the index labels of the sessions to the list of their contributions
+@profile.timed('group_contributions')
+def group_contributions(contributions):
+	grouped = {}
+	for contribution in contributions[list(Contribution._fields)].itertuples(index=False, name=None):
+		contribution = Contribution(*contribution)
+		grouped.setdefault(contribution.session, []).append(contribution)
+	return grouped
+
+################################################################################
+# The BoA is written block by block, a block being the parent session of       #
+# subsessions like A01_01 or S06c.05, see subsession_separation_chars. The     #
+# sessions are grouped by their block once, so no writer needs to scan the     #
+# whole frame for the sessions of its block.                                   #
+################################################################################
+# map every block to the DataFrame of its sessions, both sorted by name as
+# strings, as the sessions always were, so MS10 comes before MS2
+def index_blocks(sessions):
+	shorts = sessions['session_short'].astype(str)
+	keys = shorts.str.split(subsession_separation_chars, n=1, regex=True).str[0]
+	blocks = {}
+	for block, group in sessions.groupby(keys, sort=False):
+		order = sorted(range(len(group)), key=lambda i: shorts[group.index[i]])
+		blocks[block] = group.iloc[order]
+	return {block: blocks[block] for block in sorted(blocks)}
+
+# the blocks whose name starts with the given acronym
+def select_blocks(blocks, acronym):
+	return {block: sessions for block, sessions in blocks.items() if block.startswith(acronym)}
+
+# all sessions of the given blocks as a single DataFrame
+def join_blocks(blocks, columns):
+	if not blocks:
+		return pd.DataFrame(columns=columns)
+	return pd.concat(blocks.values())
+
+################################################################################
+# Report of --profile: the timers above as JSON, and with cprofile or          #
+# tracemalloc also the hottest functions or the largest allocation sites.      #
+################################################################################
+def write_profile(fname, seconds, profiler=None, top=25):
+	report = {'seconds': seconds, 'stages': profile.summary()}
+	if profiler is not None:
+		profiler.dump_stats(os.path.splitext(fname)[0] + '.prof')
+		stats = pstats.Stats(profiler).stats
+		hottest = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+		report['cprofile'] = [{'function': f'{file}:{line}({func})', 'calls': nc, 'tottime': tt, 'cumtime': ct}
+							  for (file, line, func), (cc, nc, tt, ct, callers) in hottest]
+	if tracemalloc.is_tracing():
+		report['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+		sites = tracemalloc.take_snapshot().statistics('lineno')[:top]
+		report['tracemalloc'] = [{'site': str(site.traceback), 'bytes': site.size, 'blocks': site.count}
+								 for site in sites]
+	with open(fname, 'w') as f:
+		json.dump(report, f, indent=1)
+	
+	print(f'\n{"stage":<26}{"calls":>8}{"seconds":>10}{"MiB out":>10}')
+	for name, stat in sorted(report['stages'].items(), key=lambda item: item[1]['seconds'], reverse=True):
+		print(f'{name:<26}{stat["calls"]:>8}{stat["seconds"]:>10.3f}{stat["bytes"]/2**20:>10.2f}')
+	print(f'total {seconds:.3f} s, profile written to {fname}')
 
 ################################################################################
 # Main function                                                                #
@@ -763,8 +1524,27 @@ def make_session_plans(sessions, withMises):
 def main():
 	parser = argparse.ArgumentParser(description='Generate PDFs for conference materials.')
 	parser.add_argument('-m', '--withMises', action='store_true', help='onclude von Mises lecturer(s) and title(s)')
+	parser.add_argument('--no-cache', action='store_true', help='parse CSV/sessions.csv even if a cached copy of the parsed data exists')
+	parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='number of processes rendering the room and day plans (default: 1)')
+	parser.add_argument('-f', '--force', action='store_true', help=f'rewrite all LaTeX files, even those that {manifest_file} lists as up to date')
+	parser.add_argument('--html', action='store_true', help=f'only write the program as HTML pages and JSON to {html_outdir}, skipping the LaTeX files')
+	parser.add_argument('--profile', nargs='?', const='profile.json', metavar='FILE', help='time the stages, writers and converters and write a JSON summary to FILE (default: profile.json)')
+	parser.add_argument('--profile-with', choices=['cprofile', 'tracemalloc'], help='together with --profile, also run under cProfile (stats dumped next to FILE as .prof) or trace the peak memory with tracemalloc')
 	args = parser.parse_args()
 	
+	profiler = None
+	if args.profile_with and not args.profile:
+		args.profile = 'profile.json'
+	if args.profile:
+		profile.enabled = True
+		if args.profile_with == 'cprofile':
+			profiler = cProfile.Profile()
+			profiler.enable()
+		elif args.profile_with == 'tracemalloc':
+			profile.memory = True
+			tracemalloc.start()
+	tic = time.perf_counter()
+	
 	if args.withMises:
 		withMises = True
 	else:
@@ -773,26 +1553,41 @@ def main():
 	print(f'\nInclude von Mises Prize lectures: {withMises}\n\n')
 	
 	# Read the Sessions exported from ConfTool
-	sessions = pd.read_csv('CSV/sessions.csv', sep=';', quotechar='"')
-	sessions['session_start'] = pd.to_datetime(sessions['session_start'])
-	sessions['session_end'] = pd.to_datetime(sessions['session_end'])
+	sessions = load_sessions('CSV/sessions.csv', use_cache=not args.no_cache)
+	contributions = group_contributions(melt_contributions(sessions))
+	
+	if args.html:
+		print('\nGenerating HTML program\n')
+		make_html(sessions, contributions, withMises=withMises)
+	else:
+		manifest = Manifest(manifest_file, force=args.force)
+		pool = ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 else None
+	
+		# print('\nGenerating book of abstracts LaTeX files\n')
+		# make_boa(sessions, contributions, withMises=withMises, manifest=manifest)
+	
+		# Daily Scientific Program
+		# make a PDF of one table per each starting time of sessions.
+		# Left to right is chronological talks within the sessions, top to bottom is the different sessions at the same time
+		print('\nGenerating Session Table LaTeX files\n')
+		make_dsp(sessions, contributions, withMises=withMises, manifest=manifest)
 	
-	# print('\nGenerating book of abstracts LaTeX files\n')
-	# make_boa(sessions, withMises=withMises)
+		# Make separate PDFs for each room, listing contributions there chronologically day by day
+		# print('\nGenerating Room Plan LaTeX files\n')  # TODO: RWTH revert
+		# make_room_plans(sessions, contributions, withMises=withMises, manifest=manifest, pool=pool)
 	
-	# Daily Scientific Program
-	# make a PDF of one table per each starting time of sessions.
-	# Left to right is chronological talks within the sessions, top to bottom is the different sessions at the same time
-	print('\nGenerating Session Table LaTeX files\n')
-	make_dsp(sessions, withMises=withMises)
+		# Make pages for each session, so per room and starttime. Group them into PDFs by day
+		print('\nGenerating Daily Room Plan LaTeX files\n')
+		make_session_plans(sessions, contributions, withMises=withMises, manifest=manifest, pool=pool)
 	
-	# Make separate PDFs for each room, listing contributions there chronologically day by day
-	# print('\nGenerating Room Plan LaTeX files\n')  # TODO: RWTH revert
-	# make_room_plans(sessions, withMises=withMises)
+		manifest.save()
+		if pool is not None:
+			pool.shutdown()
 	
-	# Make pages for each session, so per room and starttime. Group them into PDFs by day
-	print('\nGenerating Daily Room Plan LaTeX files\n')
-	make_session_plans(sessions, withMises=withMises)
+	if args.profile:
+		if profiler is not None:
+			profiler.disable()
+		write_profile(args.profile, time.perf_counter() - tic, profiler)
 
 if __name__ == "__main__":
 	main()
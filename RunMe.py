@@ -6,68 +6,491 @@
 import subprocess
 import os
 import sys
+import re
+import time
 import argparse
 import shutil
-from glob import glob
+import hashlib
+import json
+import threading
+import traceback
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-def make_boa():
-    try:
-        os.chdir(os.path.join("LaTeX", "Book_of_abstracts"))
-        subprocess.check_call(["latexmk", "-pdf", "BookOfAbstracts.tex"])
-        shutil.copy("BookOfAbstracts.pdf", cwd)
-    finally:
-        os.chdir(cwd)
+import get_conftool_data
+import BoA_DSP_generator as generator
 
-def make_dsp():
-    try:
-        os.chdir(os.path.join("LaTeX", "Daily_Scientific_Program"))
-        subprocess.check_call(["latexmk", "-pdf", "Daily_Scientific_Program.tex"])
-        shutil.copy("Daily_Scientific_Program.pdf", cwd)
-    finally:
-        os.chdir(cwd)
+# the exports BoA_DSP_generator.py reads for the individual targets
+target_exports = {
+    "boa": ["sessions", "organizers"],
+    "dsp": ["sessions"],
+    "days": ["sessions"],
+    "rooms": ["sessions"],
+    "html": ["sessions"],
+}
 
-def make_room_plans():
-    try:
-        os.chdir(os.path.join("LaTeX", "Daily_Scientific_Program", "rooms"))
-        for tex_file in glob("*.tex"):
-            subprocess.check_call(["latexmk", "-pdf", tex_file])
-        for pdf_file in glob("*.pdf"):
-            shutil.copy(pdf_file, cwd)
-    finally:
-        os.chdir(cwd)
+boa_document = (os.path.join("LaTeX", "Book_of_abstracts"), "BookOfAbstracts.tex")
+dsp_document = (os.path.join("LaTeX", "Daily_Scientific_Program"), "Daily_Scientific_Program.tex")
+
+################################################################################
+# Precompiled formats: the preambles of the BoA, the DSP and the room plans    #
+# (the document class and the style files it loads) are dumped once into a    #
+# format with mylatexformat, so that the compiles start from the format       #
+# instead of loading all packages again. A format is keyed on the hash of its  #
+# sources and redumped when they change. Documents whose format cannot be      #
+# dumped, or fails, are compiled the normal way. The classes need XeLaTeX for  #
+# fontspec, whose fonts XeTeX cannot dump, so fontspec is only loaded after    #
+# the dumped part of the preambles.                                            #
+################################################################################
+format_engine = ("xetex", "xelatex")  # the engine of latexmk -xelatex
+
+# name: (directory, file whose preamble is dumped, further sources), the
+# paths of the files relative to the directory the documents are compiled in
+latex_formats = {
+    "gamm-boa": (boa_document[0], boa_document[1],
+                 ["gamm-boa.cls", os.path.join("..", "this-gamm.sty"),
+                  os.path.join("..", "Common", "gamm-titlepage.sty")]),
+    "gamm-dsp": (dsp_document[0], dsp_document[1],
+                 ["gamm-dsp.cls", os.path.join("..", "this-gamm.sty"),
+                  os.path.join("..", "Common", "gamm-titlepage.sty")]),
+    "gamm-room": (os.path.join(dsp_document[0], "rooms"), os.path.join("..", "room_template.tex"), []),
+}
+
+# the BoA (and its chapters) and the DSP have formats of their own, the room
+# plans share one
+def document_format(directory, tex_file):
+    directory = os.path.normpath(directory)
+    if directory == os.path.normpath(boa_document[0]) and tex_file.startswith("BookOfAbstracts"):
+        return "gamm-boa"
+    if (directory, tex_file) == dsp_document:
+        return "gamm-dsp"
+    if directory == os.path.normpath(latex_formats["gamm-room"][0]):
+        return "gamm-room"
+    return None
+
+# the part of the preamble that goes into the format
+def preamble(fname):
+    with open(fname, 'rb') as f:
+        return f.read().split(b'\\begin{document}')[0].split(b'\\csname endofdump\\endcsname')[0]
+
+class Formats:
+    def __init__(self):
+        self.locks = {name: threading.Lock() for name in latex_formats}
+        self.ready = {}
+
+    def key(self, name):
+        directory, preamble_file, sources = latex_formats[name]
+        key = hashlib.sha256(repr(format_engine).encode())
+        key.update(preamble(os.path.join(directory, preamble_file)))
+        for source in sources:
+            with open(os.path.join(directory, source), 'rb') as f:
+                key.update(f.read())
+        return key.hexdigest()
+
+    # the name of the up to date format, dumping it first if needed, or None
+    # if it cannot be dumped. The dump is only retried once the sources change.
+    def get(self, name):
+        if name is None:
+            return None
+        with self.locks[name]:
+            key = self.key(name)
+            if self.ready.get(name, (None,))[0] != key:
+                self.ready[name] = (key, self.dump(name, key))
+            return name if self.ready[name][1] else None
+
+    def dump(self, name, key):
+        directory, preamble_file, _ = latex_formats[name]
+        key_file = os.path.join(directory, name + ".fmt.json")
+        if os.path.exists(key_file):
+            with open(key_file) as f:
+                recorded = json.load(f)
+            if recorded["key"] == key and (not recorded["ok"] or os.path.exists(os.path.join(directory, name + ".fmt"))):
+                return recorded["ok"]
+
+        engine, fmt = format_engine
+        tic = time.perf_counter()
+        with open(os.path.join(directory, name + ".fmt.log"), 'w') as log:
+            try:
+                returncode = subprocess.call([engine, "-ini", "-interaction=nonstopmode", f"-jobname={name}",
+                                              f"&{fmt}", "mylatexformat.ltx", preamble_file],
+                                             cwd=directory, stdin=subprocess.DEVNULL, stdout=log,
+                                             stderr=subprocess.STDOUT)
+            except OSError as e:  # e.g. the engine is not installed
+                log.write(f"{engine}: {e}\n")
+                returncode = None
+        ok = returncode == 0 and os.path.exists(os.path.join(directory, name + ".fmt"))
+        print(f"format {name}: {'dumped' if ok else 'FAILED, compiling without it'} ({time.perf_counter() - tic:.1f} s)")
+        with open(key_file, 'w') as f:
+            json.dump({"key": key, "ok": ok}, f)
+        return ok
+
+################################################################################
+# LaTeX compilation: every document is an independent latexmk job, run in its #
+# own working directory, so the jobs can be run concurrently in a bounded pool #
+################################################################################
+def latexmk(directory, tex_file, log_file, fmt=None):
+    command = ["latexmk", "-xelatex"]
+    if fmt is not None:
+        command.append(f"-xelatex={format_engine[1]} -fmt={fmt} %O %S")
+    with open(log_file, 'w') as log:
+        return subprocess.call(command + [tex_file], cwd=directory,
+                               stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT)
+
+# a document failing with its format is compiled once more without it
+def compile_job(directory, tex_file, formats=None):
+    log_file = os.path.join(directory, os.path.splitext(tex_file)[0] + '.latexmk.log')
+    tic = time.perf_counter()
+    fmt = formats.get(document_format(directory, tex_file)) if formats is not None else None
+    returncode = latexmk(directory, tex_file, log_file, fmt)
+    if returncode != 0 and fmt is not None:
+        returncode = latexmk(directory, tex_file, log_file)
+    return returncode, time.perf_counter() - tic, log_file
+
+# Documents are compiled in at most max_jobs concurrent latexmk processes as
+# soon as they are submitted, i.e. while the generator is still writing the
+# next ones. finish waits for all of them and copies the PDFs to the current
+# directory.
+class CompileQueue:
+    def __init__(self, max_jobs, formats=None):
+        self.max_jobs = max_jobs
+        self.formats = formats
+        self.pool = ThreadPoolExecutor(max_workers=max_jobs)
+        self.pipelines = ThreadPoolExecutor(max_workers=1)  # documents made of several compiles
+        self.jobs = []
+        self.tic = time.perf_counter()
+
+    def submit(self, directory, tex_file):
+        future = self.pool.submit(compile_job, directory, tex_file, self.formats)
+        future.add_done_callback(lambda future: self.report(tex_file, future))
+        self.jobs.append((directory, tex_file, future))
+
+    # the chunks of the BoA are compiled in the pool, and the BoA once they are done
+    def submit_boa_chunks(self, chunks):
+        future = self.pipelines.submit(compile_boa_chunks, self, chunks)
+        future.add_done_callback(lambda future: self.report(boa_document[1], future))
+        self.jobs.append((*boa_document, future))
+
+    # for the done callbacks of the generator, which pass the file name
+    def submit_file(self, fname):
+        self.submit(os.path.dirname(fname), os.path.basename(fname))
+
+    def report(self, tex_file, future):
+        if future.exception() is not None:
+            print(f"{tex_file}: FAILED, {future.exception()}")
+            return
+        returncode, seconds, log_file = future.result()
+        status = "ok" if returncode == 0 else f"FAILED, see {log_file}"
+        print(f"{tex_file}: {status} ({seconds:.1f} s)")
+
+    def finish(self):
+        self.pipelines.shutdown(wait=True)
+        self.pool.shutdown(wait=True)
+        wall = time.perf_counter() - self.tic
+
+        failed = []
+        times = []
+        for directory, tex_file, future in self.jobs:
+            if future.exception() is not None or future.result()[0] != 0:
+                failed.append(tex_file)
+                continue
+            times.append(future.result()[1])
+            shutil.copy(os.path.join(directory, os.path.splitext(tex_file)[0] + ".pdf"), ".")
+
+        print(f"\n{len(self.jobs)} documents compiled with up to {self.max_jobs} jobs in {wall:.1f} s wall-clock "
+              f"(slowest document {max(times, default=0):.1f} s, {sum(times):.1f} s in total)")
+        return failed
+
+################################################################################
+# Chunked book of abstracts: every chapter is compiled as a document of its    #
+# own (see BoA_DSP_generator.write_boa_chunks), all of them in parallel, each  #
+# starting at the page it has in the book. The BoA then only typesets the      #
+# title pages, the table of contents merged from the .toc files of the         #
+# chapters and the index with the speaker labels of their .aux files, and      #
+# includes the PDFs of the chapters. Links inside the chapters are lost on the #
+# way, the outline is rebuilt from the table of contents. The page counts are  #
+# kept in BookOfAbstracts.chunks.json for the next build; chapters whose       #
+# offset turns out wrong are compiled again.                                   #
+################################################################################
+boa_chunks_state = os.path.join(boa_document[0], "BookOfAbstracts.chunks.json")
+boa_chunks_rounds = 3  # bound on recompiling after the front matter changed length
+
+def chunk_file(directory, tex_file, extension):
+    return os.path.join(directory, os.path.splitext(tex_file)[0] + extension)
+
+def read_log(directory, tex_file):
+    with open(chunk_file(directory, tex_file, ".log"), errors="replace") as f:
+        return f.read()
+
+def pdf_pages(directory, tex_file):
+    match = re.search(r"Output written on .*?\((\d+)\s+pages?", read_log(directory, tex_file), re.S)
+    return int(match.group(1)) if match else 1
+
+# the page the first chapter starts on, reported by the BoA
+def chunks_start(directory, tex_file):
+    match = re.search(r"boa-chunks-start=(\d+)", read_log(directory, tex_file))
+    return int(match.group(1)) if match else None
+
+def chunk_offsets(state, chunks):
+    offsets = {}
+    page = state["start"]
+    for tex_file in chunks:
+        offsets[tex_file] = page
+        page += state["pages"].get(tex_file, 1)
+    return offsets, page
+
+# the table of contents of the chapters, with the links pointing to the pages
+# of the BoA, followed by the entry of the index. \includepdf drops the outline
+# of the chapter PDFs, so it is rebuilt from the same entries as \bookmark
+# commands pointing to the page anchors of the BoA.
+bookmark_levels = {"part": -1, "chapter": 0, "section": 1, "subsection": 2, "subsubsection": 3}
+
+def merge_tocs(directory, chunks, index_page):
+    entry = re.compile(r"\{([^{}]*)\}\{([^{}]*)\}(%?)\s*$")
+    contentsline = re.compile(r"\\contentsline\s*\{(\w+)\}\{(.*)\}\{([^{}]*)\}\{([^{}]*)\}%?\s*$")
+    lines = []
+    for tex_file in chunks:
+        toc = chunk_file(directory, tex_file, ".toc")
+        if not os.path.exists(toc):
+            continue
+        with open(toc, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("\\contentsline"):
+                    line = entry.sub(lambda m: f"{{{m[1]}}}{{page.{m[1]}}}{m[3]}\n", line)
+                lines.append(line)
+    lines.append(f"\\contentsline {{chapter}}{{\\speakerindexname}}{{{index_page}}}{{page.{index_page}}}%\n")
+    with open(chunk_file(directory, boa_document[1], ".chunks.toc"), "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    bookmarks = []
+    for line in lines:
+        match = contentsline.match(line)
+        if match and match[1] in bookmark_levels:
+            title = re.sub(r"\\numberline\s*\{([^{}]*)\}", r"\1 ", match[2])
+            bookmarks.append(f"\\bookmark[dest={{{match[4]}}},level={bookmark_levels[match[1]]}]{{{title}}}\n")
+    with open(chunk_file(directory, boa_document[1], ".chunks.bookmarks"), "w", encoding="utf-8") as f:
+        f.writelines(bookmarks)
+
+# the labels of the speakers set in the chapters, see \presenter in
+# gamm-boa.cls, with the links pointing to the pages of the BoA
+def merge_labels(directory, chunks):
+    label = re.compile(r"^\\newlabel\{presenter-[^{}]*\}\{\{[^{}]*\}\{([^{}]*)\}.*\{([^{}]*)\}\{([^{}]*)\}\}\s*$")
+    lines = []
+    for tex_file in chunks:
+        aux = chunk_file(directory, tex_file, ".aux")
+        if not os.path.exists(aux):
+            continue
+        with open(aux, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = label.match(line)
+                if match:
+                    start, end = match.span(2)
+                    lines.append(line[:start] + f"page.{match[1]}" + line[end:].rstrip() + "\n")
+    with open(chunk_file(directory, boa_document[1], ".chunks.labels"), "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+def compile_boa_chunks(queue, chunks):
+    directory, tex_file = boa_document
+    tic = time.perf_counter()
+    state = {"start": 3, "pages": {}}
+    if os.path.exists(boa_chunks_state):
+        with open(boa_chunks_state) as f:
+            state = json.load(f)
+
+    compiled = {}
+    for _ in range(boa_chunks_rounds):
+        offsets, index_page = chunk_offsets(state, chunks)
+        while pending := [chunk for chunk in chunks if compiled.get(chunk) != offsets[chunk]]:
+            jobs = []
+            for chunk in pending:
+                with open(chunk_file(directory, chunk, ".offset"), "w") as f:
+                    f.write(f"\\setcounter{{page}}{{{offsets[chunk]}}}\n")
+                future = queue.pool.submit(compile_job, directory, chunk, queue.formats)
+                future.add_done_callback(lambda future, chunk=chunk: queue.report(chunk, future))
+                jobs.append((chunk, future))
+            for chunk, future in jobs:
+                returncode, _, log_file = future.result()
+                if returncode != 0:
+                    return returncode, time.perf_counter() - tic, log_file
+                compiled[chunk] = offsets[chunk]
+                state["pages"][chunk] = pdf_pages(directory, chunk)
+            offsets, index_page = chunk_offsets(state, chunks)
+
+        merge_tocs(directory, chunks, index_page)
+        merge_labels(directory, chunks)
+        returncode, _, log_file = compile_job(directory, tex_file, queue.formats)
+        start = chunks_start(directory, tex_file) if returncode == 0 else None
+        if start is None or start == state["start"]:
+            break
+        state["start"] = start  # the table of contents changed length, move all chapters
+
+    with open(boa_chunks_state, "w") as f:
+        json.dump(state, f, indent=1)
+    return returncode, time.perf_counter() - tic, log_file
+
+################################################################################
+# Generate the LaTeX files of the targets, each document is compiled as soon   #
+# as it is written, the longest (the BoA) first. Given the sessions that       #
+# changed since the last build, only the affected documents are redone: the    #
+# BoA for any change, the DSP and the plans of the rooms and days the changed  #
+# sessions were or are scheduled in for changes of the schedule. The HTML      #
+# program needs no compilation and is written before everything else.          #
+################################################################################
+def build(targets, sessions, contributions, withMises, manifest, max_jobs, changed=None, rescheduled=None, pool=None,
+          formats=None, boa_chunks=False):
+    queue = CompileQueue(max_jobs, formats)
+    if "html" in targets and (rescheduled is None or not rescheduled.empty):
+        generator.make_html(sessions, contributions, withMises)
+    if "boa" in targets and (changed is None or not changed.empty):
+        chunks = generator.make_boa(sessions, contributions, withMises, manifest, chunks=boa_chunks)
+        if boa_chunks:
+            queue.submit_boa_chunks(chunks)
+        else:
+            queue.submit(*boa_document)
+    if "dsp" in targets and (rescheduled is None or not rescheduled.empty):
+        generator.make_dsp(sessions, contributions, withMises, manifest)
+        queue.submit(*dsp_document)
+    if "days" in targets:
+        days = sessions
+        if rescheduled is not None:
+            days = sessions[sessions['session_start'].dt.date.isin(set(rescheduled['session_start'].dt.date))]
+        generator.make_session_plans(days, contributions, withMises, manifest, done=queue.submit_file, pool=pool)
+    if "rooms" in targets:
+        rooms = sessions
+        if rescheduled is not None:
+            rooms = sessions[sessions['session_room'].astype(str).isin(set(rescheduled['session_room'].astype(str)))]
+        generator.make_room_plans(rooms, contributions, withMises, manifest, done=queue.submit_file, pool=pool)
+    manifest.save()
+    return queue.finish()
+
+# worker processes rendering the room and day plans. They are spawned rather
+# than forked, as the latexmk jobs are run from threads at the same time.
+def make_pool(max_jobs):
+    if max_jobs < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=max_jobs, mp_context=multiprocessing.get_context("spawn"))
+
+# the targets whose exports changed since the target was last built successfully
+def stale_targets(targets):
+    cache = get_conftool_data.load_cache()
+    return [target for target in targets if get_conftool_data.exports_changed(target, target_exports[target], cache)]
+
+def mark_built(targets):
+    for target in targets:
+        get_conftool_data.mark_built(target, target_exports[target])
+
+def load_model():
+    sessions = generator.load_sessions('CSV/sessions.csv')
+    contributions = generator.group_contributions(generator.melt_contributions(sessions))
+    return sessions, contributions
+
+# Watch mode: poll ConfTool every interval seconds and rebuild what changed.
+# The parsed sessions and the manifest are kept in memory between the polls,
+# changes are found by comparing the new sessions table with the previous one.
+# A poll that fails for whatever reason, or whose compilation fails, is
+# reported and the sessions of the last good build are kept, so the following
+# polls redo everything changed since until a build succeeds.
+def watch(targets, exports, withMises, max_jobs, interval, pool=None, formats=None, boa_chunks=False):
+    manifest = generator.Manifest()
+    sessions = None
+    while True:
+        tic = time.perf_counter()
+        try:
+            get_conftool_data.fetch_exports(exports, use_cache=True)
+            if sessions is None:
+                new_sessions, contributions = load_model()
+                failed = build(targets, new_sessions, contributions, withMises, manifest, max_jobs, pool=pool,
+                               formats=formats, boa_chunks=boa_chunks)
+                what = "full build"
+            elif stale_targets(targets):
+                new_sessions, contributions = load_model()
+                changed = generator.changed_sessions(sessions, new_sessions)
+                rescheduled = generator.changed_sessions(generator.schedule_columns(sessions),
+                                                         generator.schedule_columns(new_sessions))
+                what = (f"{changed['session_short'].nunique()} sessions changed, "
+                        f"{rescheduled['session_short'].nunique()} of them rescheduled")
+                if "boa" in targets and get_conftool_data.exports_changed("boa", ["organizers"]):
+                    changed = None  # the BoA needs to be redone for the organizers
+                    what += ", organizers changed"
+                failed = build(targets, new_sessions, contributions, withMises, manifest, max_jobs, changed,
+                               rescheduled, pool, formats, boa_chunks)
+            else:
+                what = None
+        except get_conftool_data.ExportError as e:
+            print(f"Export failed, retrying in {interval:.0f} s: {e}")
+            time.sleep(interval)
+            continue
+        except Exception:
+            traceback.print_exc()
+            print(f"Update failed, retrying in {interval:.0f} s")
+            time.sleep(interval)
+            continue
+        if what is not None:
+            if not failed:
+                sessions = new_sessions
+                mark_built(targets)
+            status = f", compilation failed for: {', '.join(failed)}" if failed else ""
+            print(f"[{time.strftime('%H:%M:%S')}] {what}, updated in {time.perf_counter() - tic:.1f} s{status}")
+        time.sleep(max(0, interval - (time.perf_counter() - tic)))
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Generate PDFs for conference materials.')
     parser.add_argument('-b', '--boa', action='store_true', help='Generate book of abstracts')
     parser.add_argument('-d', '-s', '--dsp', action='store_true', help='Generate daily scientific program')
     parser.add_argument('-r', '--rooms', action='store_true', help='Generate room plans')
+    parser.add_argument('-D', '--days', action='store_true', help='Generate day plans, one page per session and room')
+    parser.add_argument('-H', '--html', action='store_true', help='Generate the program as HTML pages per day and room and as JSON, without any TeX run')
     parser.add_argument('-a', '--all', action='store_true', help='Generate all PDFs. This is equivalent to "no option", i.e. the default behavior.')
-    parser.add_argument('-m', '--withMises', action='store_true', help='Generate PDFs including the von Mises Lecturer(s). Needs to be used together with one of the other options for target selection.')
+    parser.add_argument('-c', '--cache', action='store_true', help='Only rewrite CSV files that changed in ConfTool and only generate and compile the selected targets whose files changed since the target was last built.')
+    parser.add_argument('--ttl', type=float, default=0, metavar='SECONDS', help='Together with --cache, do not contact ConfTool at all if the data was fetched less than SECONDS ago.')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), metavar='N', help='Number of LaTeX documents compiled concurrently and of processes rendering the room and day plans (default: number of CPUs).')
+    parser.add_argument('--boa-chunks', action='store_true', help='Compile the chapters of the book of abstracts in parallel, as documents of their own, and merge them into the book.')
+    parser.add_argument('--no-formats', action='store_true', help='Compile every document with its full preamble instead of a precompiled format.')
+    parser.add_argument('-w', '--watch', type=float, metavar='SECONDS', help='Keep running, poll ConfTool every SECONDS and rebuild only the PDFs affected by changes.')
+    parser.add_argument('-m', '--withMises', action='store_true', help='Generate PDFs including the von Mises Lecturer(s).')
     return parser.parse_args()
 
 def main():
     args = parse_arguments()
-    
-    # Fetch data from ConfTool Pro
-    subprocess.check_call([sys.executable, "get_conftool_data.py"])
-
-    # Create LaTeX files
-    if args.withMises:
-        subprocess.check_call([sys.executable, "BoA_DSP_generator.py", "--withMises"])
-    else:
-        subprocess.check_call([sys.executable, "BoA_DSP_generator.py"])
-
-    if args.boa:
-        make_boa()
-    if args.dsp:
-        make_dsp()
-    if args.rooms:
-        make_room_plans()
-    if args.all or not any(vars(args).values()):
-        make_boa()
-        make_dsp()
-        make_room_plans()
+    build_all = args.all or not any((args.boa, args.dsp, args.rooms, args.days, args.html))
+    targets = [target for target in target_exports if build_all or getattr(args, target)]
+
+    exports = sorted({name for target in targets for name in target_exports[target]})
+    formats = None if args.no_formats else Formats()
+    if args.watch:
+        pool = make_pool(args.jobs)
+        try:
+            watch(targets, exports, args.withMises, max(1, args.jobs), args.watch, pool, formats, args.boa_chunks)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        return
+
+    # Fetch the data needed for the targets from ConfTool Pro
+    use_cache = args.cache or args.ttl > 0
+    try:
+        get_conftool_data.fetch_exports(exports, use_cache=use_cache, ttl=args.ttl)
+    except get_conftool_data.ExportError as e:
+        sys.exit(f"Export failed: {e}")
+    if use_cache:
+        targets = stale_targets(targets)
+        if not targets:
+            print("ConfTool data unchanged, nothing to be done.")
+            return
+
+    print(f'\nInclude von Mises Prize lectures: {args.withMises}\n')
+    sessions, contributions = load_model()
+    pool = make_pool(args.jobs)
+    try:
+        failed = build(targets, sessions, contributions, args.withMises, generator.Manifest(), max(1, args.jobs),
+                       pool=pool, formats=formats, boa_chunks=args.boa_chunks)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    if failed:
+        sys.exit(f"compilation failed for: {', '.join(failed)}")
+    mark_built(targets)
 
 if __name__ == "__main__":
-    cwd = os.getcwd()
     main()
\ No newline at end of file
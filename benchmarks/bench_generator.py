@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# This file is part of the GAMM_PDFs_FROM_CONFTOOL project.
+# Copyright GAMM_PDFs_FROM_CONFTOOL developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (https://opensource.org/licenses/BSD-2-Clause)
+
+# End-to-end benchmark of BoA_DSP_generator.py on synthetic conferences, see
+# synthetic_conference.py. For every scale the exports are written to a
+# scratch copy of the LaTeX tree, and loading, html2latex, utf8_clean,
+# make_boa, make_dsp, make_room_plans, make_session_plans and make_html are
+# timed separately. A second pass under tracemalloc records the peak memory of
+# every stage. The results go to a JSON report, so runs can be compared over time.
+
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import BoA_DSP_generator as generator
+from html2latex import html2latex
+from synthetic_conference import write_conference
+
+outputs = {
+    'make_boa': ['LaTeX/Book_of_abstracts/BookOfAbstracts.tex', 'LaTeX/Book_of_abstracts/BookOfAbstracts.ind',
+                 'LaTeX/Book_of_abstracts/Sessions'],
+    'make_dsp': ['LaTeX/Daily_Scientific_Program/Daily_Scientific_Program.tex',
+                 'LaTeX/Daily_Scientific_Program/Daily_Scientific_Program.ind'],
+    'make_room_plans': ['LaTeX/Daily_Scientific_Program/rooms'],
+    'make_session_plans': ['LaTeX/Daily_Scientific_Program/days'],
+    'make_html': ['HTML', 'HTML/days', 'HTML/rooms'],
+}
+
+# the stages in pipeline order, each a function of the state of the previous
+# ones returning the number of items it processed
+def stages():
+    def load(state):
+        state['sessions'] = generator.read_sessions_csv('CSV/sessions.csv')
+        return len(state['sessions'])
+    def contributions(state):
+        state['contributions'] = generator.group_contributions(generator.melt_contributions(state['sessions']))
+        return sum(map(len, state['contributions'].values()))
+    def abstracts(state):
+        state['latex'] = [html2latex(c.abstract) for cs in state['contributions'].values() for c in cs
+                          if isinstance(c.abstract, str)]
+        return len(state['latex'])
+    def clean(state):
+        for abstract in state['latex']:
+            generator.utf8_clean(abstract)
+        return len(state['latex'])
+    def document(make):
+        return lambda state: make(state['sessions'], state['contributions'], False) or len(state['sessions'])
+    return [('load', load),
+            ('contributions', contributions),
+            ('html2latex', abstracts),
+            ('utf8_clean', clean),
+            ('make_boa', document(generator.make_boa)),
+            ('make_dsp', document(generator.make_dsp)),
+            ('make_room_plans', document(generator.make_room_plans)),
+            ('make_session_plans', document(generator.make_session_plans)),
+            ('make_html', document(generator.make_html))]
+
+def output_bytes(paths):
+    size = 0
+    for path in paths:
+        if os.path.isdir(path):
+            size += sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+        elif os.path.exists(path):
+            size += os.path.getsize(path)
+    return size
+
+def clear_outputs():
+    for paths in outputs.values():
+        for path in paths:
+            if os.path.isdir(path):
+                for entry in os.scandir(path):
+                    if entry.name.endswith('.tex'):
+                        os.remove(entry.path)
+            elif os.path.exists(path):
+                os.remove(path)
+
+# run all stages once, the generator's progress messages are swallowed
+def run(memory=False):
+    state = {}
+    results = {}
+    clear_outputs()
+    for name, stage in stages():
+        if memory:
+            tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            tic = time.perf_counter()
+            items = stage(state)
+            seconds = time.perf_counter() - tic
+        result = {'seconds': seconds, 'items': items}
+        if memory:
+            result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[name] = result
+    return results
+
+def bench(contributions, seed, repeat, memory):
+    workdir = tempfile.mkdtemp(prefix='bench_generator_')
+    cwd = os.getcwd()
+    try:
+        shutil.copytree(os.path.join(root, 'LaTeX'), os.path.join(workdir, 'LaTeX'))
+        n_sessions, n_contributions = write_conference(os.path.join(workdir, 'CSV'), contributions, seed)
+        os.chdir(workdir)
+        runs = [run() for _ in range(repeat)]
+        stats = {name: {'seconds': min(r[name]['seconds'] for r in runs), 'items': runs[0][name]['items']}
+                 for name in runs[0]}
+        for name, paths in outputs.items():
+            stats[name]['output_bytes'] = output_bytes(paths)
+        if memory:
+            for name, result in run(memory=True).items():
+                stats[name]['peak_bytes'] = result['peak_bytes']
+        for result in stats.values():
+            result['items_per_second'] = result['items'] / result['seconds'] if result['seconds'] else None
+        return {'sessions': n_sessions, 'contributions': n_contributions,
+                'csv_bytes': os.path.getsize('CSV/sessions.csv'), 'stages': stats}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the generator stages on synthetic conferences.')
+    parser.add_argument('-n', '--contributions', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='approximate numbers of contributions to benchmark (default: 100 1000 10000)')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='number of timing runs, the best one is reported')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the synthetic programs (default: 1)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass measuring peak memory')
+    parser.add_argument('-o', '--report', default='bench_generator.json', help='JSON report to write (default: bench_generator.json)')
+    args = parser.parse_args()
+
+    report = {'date': dt.datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'pandas': generator.pd.__version__,
+              'cache_format': generator.cache_format,
+              'seed': args.seed,
+              'repeat': args.repeat,
+              'runs': []}
+    for contributions in args.contributions:
+        result = bench(contributions, args.seed, args.repeat, not args.no_memory)
+        report['runs'].append(result)
+        print(f'\n{result["contributions"]} contributions in {result["sessions"]} sessions, '
+              f'{result["csv_bytes"]/2**20:.2f} MiB CSV')
+        for name, stage in result['stages'].items():
+            peak = f'{stage["peak_bytes"]/2**20:8.2f} MiB' if 'peak_bytes' in stage else ''
+            print(f'  {name:<20}{stage["seconds"]*1000:10.2f} ms {stage["items_per_second"]:12.0f} items/s {peak}')
+
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'\nreport written to {args.report}')
+
+if __name__ == "__main__":
+    main()
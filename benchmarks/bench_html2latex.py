@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# This file is part of the GAMM_PDFs_FROM_CONFTOOL project.
+# Copyright GAMM_PDFs_FROM_CONFTOOL developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (https://opensource.org/licenses/BSD-2-Clause)
+
+# Micro-benchmark of html2latex on all abstracts of a sessions export. It
+# compares the single-pass translator against the former implementation doing
+# one replacement pass per tag, checks that both produce identical output and
+# that applying html2latex twice is harmless.
+
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from html2latex import html2latex
+
+# the sequential implementation html2latex replaced, kept as reference
+def html2latex_sequential(instr):
+    instr = instr.replace('<br />', '\\newline ')
+    instr = re.sub('<p[^><]*>', '', instr).replace('</p>', '\\par')
+    instr = instr.replace('<li>', '\\item ').replace('</li>', '')
+    instr = instr.replace('<ol>', '\\begin{enumerate}').replace('</ol>', '\\end{enumerate}')
+    instr = instr.replace('<ul>', '\\begin{itemize}').replace('</ul>', '\\end{itemize}')
+    instr = instr.replace('<sub>', '\\textsubscript{').replace('</sub>', '}')
+    instr = instr.replace('<sup>', '\\textsuperscript{').replace('</sup>', '}')
+    instr = instr.replace('<blockquote>', '\\begin{quote}').replace('</blockquote>', '\\end{quote}')
+    instr = instr.replace('<em>', '{\\em ').replace('</em>', '}')
+    instr = instr.replace('<strong>', '{\\bfseries ').replace('</strong>', '}')
+    instr = instr.replace('%', '\\percent')
+    return instr
+
+def read_abstracts(fname):
+    df = pd.read_csv(fname, sep=';', quotechar='"')
+    columns = [col for col in df.columns if 'abstract' in col]
+    return [a for a in df[columns].to_numpy().ravel() if isinstance(a, str)]
+
+def best_of(func, corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        for abstract in corpus:
+            func(abstract)
+        best = min(best, time.perf_counter() - tic)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark html2latex on the abstracts of a sessions export.')
+    parser.add_argument('csv', nargs='?', default='CSV/sessions.csv', help='sessions export (default: CSV/sessions.csv)')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of timing runs, the best one is reported')
+    args = parser.parse_args()
+
+    corpus = read_abstracts(args.csv)
+    size = sum(len(a) for a in corpus) / 2**20
+    print(f'{len(corpus)} abstracts, {size:.2f} MiB')
+
+    mismatches = sum(html2latex(a) != html2latex_sequential(a) for a in corpus)
+    not_idempotent = sum(html2latex(html2latex(a)) != html2latex(a) for a in corpus)
+    print(f'outputs differing from the sequential version: {mismatches}')
+    print(f'outputs changed by a second application:       {not_idempotent}')
+
+    for name, func in [('sequential', html2latex_sequential), ('single pass', html2latex)]:
+        seconds = best_of(func, corpus, args.repeat)
+        print(f'{name:<12} {seconds*1000:8.2f} ms  {size/seconds:8.2f} MiB/s')
+
+if __name__ == "__main__":
+    main()
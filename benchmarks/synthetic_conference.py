@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# This file is part of the GAMM_PDFs_FROM_CONFTOOL project.
+# Copyright GAMM_PDFs_FROM_CONFTOOL developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (https://opensource.org/licenses/BSD-2-Clause)
+
+# Generator of synthetic ConfTool exports. It writes a sessions.csv and an
+# organizers.csv with the column layout of the REST exports fetched by
+# get_conftool_data.py, for a five day meeting of the requested number of
+# contributions: Prandtl and plenary lectures, the von Mises lectures, poster
+# sessions, minisymposia, young researchers minisymposia, DFG programs and
+# contributed sessions in as many parallel rooms as needed. The abstracts
+# contain the HTML tags ConfTool produces and non-ASCII text.
+
+import argparse
+import csv
+import datetime as dt
+import math
+import os
+import random
+
+first_day = dt.datetime(2024, 9, 16)    # a Monday
+days = 5
+session_starts = [(9, 0), (14, 0), (16, 30)]  # parallel sessions of two hours
+session_minutes = 120
+slot = 15                                 # sessionlengths.default of the generator
+posters_per_session = 20
+
+surnames = ['Müller', 'Schmidt', 'Dvořák', 'Nguyen', 'García', 'Kowalski', 'Smith', 'Öztürk',
+            'Rossi', 'Johansson', 'Novák', 'Zhang', 'Lefèvre', 'Papadopoulos', 'Weiß', 'Ødegaard']
+firstnames = ['Anna', 'Bernd', 'Chloé', 'Dmitri', 'Eva', 'François', 'Gül', 'Hiroshi',
+              'Ingrid', 'Jörg', 'Katarzyna', 'Luis', 'Marta', 'Niels', 'Olga', 'Pál']
+institutions = ['Otto-von-Guericke-Universität Magdeburg', 'RWTH Aachen University',
+                'Technische Universität München', 'Université Paris-Saclay', 'ETH Zürich',
+                'Max Planck Institute for Dynamics of Complex Technical Systems',
+                'University of Cambridge', 'Politecnico di Milano', 'KTH Royal Institute of Technology',
+                'Charles University, Prague']
+topics = ['fluid mechanics', 'multibody dynamics', 'optimization', 'uncertainty quantification',
+          'numerical linear algebra', 'solid mechanics', 'control theory', 'turbulence',
+          'model order reduction', 'biomechanics', 'applied analysis', 'material modelling']
+words = ('we consider a class of problems arising in the modelling of coupled systems and derive '
+         'stable discretizations whose convergence is proven under mild assumptions on the data '
+         'numerical experiments confirm the theoretical rates and show the efficiency of the method').split()
+
+def sentence(rng, n=14):
+    text = ' '.join(rng.choice(words) for _ in range(n))
+    return text[0].upper() + text[1:] + '.'
+
+# an abstract with the HTML markup html2latex has to handle
+def abstract(rng):
+    parts = [f'<p>{sentence(rng)} For the {rng.choice(topics)} of <em>{rng.choice(surnames)}</em> type '
+             f'we obtain a speed-up of {rng.randint(2, 95)}% and errors below 10<sup>-{rng.randint(3, 12)}</sup>.</p>']
+    for _ in range(rng.randint(1, 4)):
+        parts.append(f'<p style="text-align: justify;">{sentence(rng, rng.randint(20, 60))} '
+                     f'The parameters u<sub>h</sub> &amp; p<sub>h</sub> are <strong>{rng.choice(words)}</strong>.</p>')
+    if rng.random() < 0.3:
+        items = ''.join(f'<li>{sentence(rng, 6)}</li>' for _ in range(rng.randint(2, 4)))
+        lst = rng.choice(['ul', 'ol'])
+        parts.append(f'<{lst}>{items}</{lst}>')
+    if rng.random() < 0.1:
+        parts.append(f'<blockquote>{sentence(rng)}</blockquote>')
+    return '<br />'.join(parts) if rng.random() < 0.2 else ''.join(parts)
+
+def person(rng):
+    return f'{rng.choice(surnames)}, {rng.choice(firstnames)}'
+
+# authors, organisations and presenter in the format of the ConfTool export
+def authorship(rng):
+    orgs = rng.sample(institutions, rng.randint(1, 3))
+    authors = []
+    for _ in range(rng.randint(1, 4)):
+        affiliations = sorted(rng.sample(range(1, len(orgs) + 1), rng.randint(1, len(orgs))))
+        authors.append(f'{person(rng)} ({",".join(map(str, affiliations))})')
+    organisations = '; '.join(f'{i}: {org}' for i, org in enumerate(orgs, 1))
+    return '; '.join(authors), organisations, rng.choice(authors)
+
+def fmt(time):
+    return time.strftime('%Y-%m-%d %H:%M')
+
+class Program:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.rows = []
+        self.max_talks = 0
+
+    def session(self, short, title, room, start, end, talks):
+        rng = self.rng
+        chair = person(rng)
+        row = {'session_short': short, 'session_title': title, 'session_room': room,
+               'session_start': fmt(start), 'session_end': fmt(end),
+               'chair1': f'{chair} ({rng.choice(institutions)})', 'chair1_name': chair}
+        for i, (talk_start, minutes) in enumerate(talks, 1):
+            authors, organisations, presenter = authorship(rng)
+            row.update({f'p{i}_title': f'{sentence(rng, rng.randint(4, 10))[:-1]}',
+                        f'p{i}_authors': authors,
+                        f'p{i}_organisations': organisations,
+                        f'p{i}_presenting_author': presenter,
+                        f'p{i}_abstract': abstract(rng),
+                        f'p{i}_start': fmt(talk_start),
+                        f'p{i}_end': fmt(talk_start + dt.timedelta(minutes=minutes))})
+        self.max_talks = max(self.max_talks, len(talks))
+        self.rows.append(row)
+        return len(talks)
+
+    # talks of a parallel session: mostly single slots, some double slots for
+    # topical speakers and the occasional gap, at most count talks
+    def talks(self, start, count, minutes=None):
+        talks = []
+        offset = 0
+        while len(talks) < count and offset < session_minutes:
+            if minutes is None and self.rng.random() < 0.05:
+                offset += slot
+                continue
+            length = minutes or (2 * slot if self.rng.random() < 0.08 else slot)
+            if offset + length > session_minutes:
+                break
+            talks.append((start + dt.timedelta(minutes=offset), length))
+            offset += length
+        return talks
+
+    def columns(self):
+        columns = ['session_short', 'session_title', 'session_room', 'session_start', 'session_end',
+                   'chair1', 'chair1_name']
+        for i in range(1, self.max_talks + 1):
+            columns += [f'p{i}_{field}' for field in
+                        ('title', 'authors', 'organisations', 'presenting_author', 'abstract', 'start', 'end')]
+        return columns
+
+# lay out a meeting with about the given number of contributions
+def make_conference(contributions, seed=1):
+    program = Program(seed)
+    rng = program.rng
+    day = lambda d, h, m=0: first_day + dt.timedelta(days=d, hours=h, minutes=m)
+    hour = dt.timedelta(hours=1)
+
+    count = program.session('PML', 'Prandtl Memorial Lecture', 'Main Hall', day(0, 8), day(0, 9), [(day(0, 8), 60)])
+    plenaries = max(1, min(2 * days, contributions // 200))
+    for k in range(plenaries):
+        start = day(k % days, 13 if k < days else 12)
+        count += program.session(f'PL{k + 1}', f'Plenary Lecture {k + 1}', 'Main Hall', start, start + hour,
+                                 [(start, 60)])
+    count += program.session('RvML', 'Richard von Mises Prize Lectures', 'Main Hall', day(1, 8), day(1, 9),
+                             [(day(1, 8), 30), (day(1, 8, 30), 30)])
+
+    posters = min(days - 1, max(1, contributions // 400))
+    for k in range(posters):
+        start = day(k, 18, 30)
+        count += program.session(f'Poster{k + 1}' if posters > 1 else 'Poster', 'Poster Session', 'Foyer',
+                                 start, start + hour, [(start, 0)] * posters_per_session)
+
+    # the remaining contributions go to the parallel sessions, with room for
+    # about six talks each
+    parallel = max(1, math.ceil((contributions - count) / 6))
+    slots = [day(d, h, m) for d in range(days) for h, m in session_starts]
+    rooms = max(1, math.ceil(parallel / len(slots)))
+    kinds = ['MS'] * 15 + ['YRM'] * 5 + ['DFG'] * 3 + ['A'] * 77
+    blocks = {'MS': 0, 'YRM': 0, 'DFG': 0, 'A': 0}
+    organizers = []
+    for start in slots:
+        for r in range(rooms):
+            remaining = contributions - count
+            if remaining <= 0:
+                break
+            kind = rng.choice(kinds)
+            blocks[kind] += 1
+            number = blocks[kind]
+            if kind in ('MS', 'YRM'):
+                short, title = f'{kind}{number}_1', f'{rng.choice(topics).capitalize()} ({kind}{number})'
+                talks = program.talks(start, min(4, remaining), minutes=2 * slot)
+                organizers += [(person(rng), rng.choice(institutions)) for _ in range(2)]
+            elif kind == 'DFG':
+                short, title = f'DFG-SPP{2000 + number}', f'DFG Priority Programme {2000 + number}'
+                talks = program.talks(start, min(7, remaining))
+            else:
+                short, title = f'A{(number - 1) // 4 + 1:02d}.{(number - 1) % 4 + 1:02d}', \
+                               f'Section {(number - 1) // 4 + 1}: {topics[((number - 1) // 4) % len(topics)]}'
+                talks = program.talks(start, min(8, remaining))
+            room = f'Room {r + 1:02d}' if r % 10 else f'Lecture Hall {r // 10 + 1}'
+            count += program.session(short, title, room, start, start + dt.timedelta(minutes=session_minutes), talks)
+
+    organizers = [{'name': name.split(', ')[0], 'firstname': name.split(', ')[1], 'organisation': org}
+                  for name, org in organizers]
+    return program, organizers, count
+
+def write_conference(outdir, contributions, seed=1):
+    program, organizers, count = make_conference(contributions, seed)
+    os.makedirs(outdir, exist_ok=True)
+    with open(os.path.join(outdir, 'sessions.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, program.columns(), delimiter=';', quotechar='"', quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        writer.writerows(program.rows)
+    with open(os.path.join(outdir, 'organizers.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, ['name', 'firstname', 'organisation'], delimiter=';', quotechar='"',
+                                quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        writer.writerows(organizers)
+    return len(program.rows), count
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic ConfTool sessions.csv and organizers.csv exports.')
+    # deliberately without default, so the real exports in CSV are never overwritten by accident
+    parser.add_argument('outdir', help='directory to write the CSV files to')
+    parser.add_argument('-n', '--contributions', type=int, default=1000, help='approximate number of contributions (default: 1000)')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the random program (default: 1)')
+    args = parser.parse_args()
+
+    sessions, contributions = write_conference(args.outdir, args.contributions, args.seed)
+    print(f'{sessions} sessions with {contributions} contributions written to {args.outdir}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# This file is part of the GAMM_PDFs_FROM_CONFTOOL project.
+# Copyright GAMM_PDFs_FROM_CONFTOOL developers and contributors. All rights reserved.
+# License: BSD 2-Clause License (https://opensource.org/licenses/BSD-2-Clause)
+
+"""
+
+A local stand-in for the REST interface of ConfTool Pro.
+
+It answers the adminExport requests of get_conftool_data.py with canned CSV
+files, checking the nonce/passhash authentication the same way ConfTool does.
+Latency and failures can be injected, so that the fetcher's timing, retry and
+validation behavior can be exercised without network access, e.g.
+
+    conftool_standin.py --data-dir /path/to/canned/CSV --latency 0.5 --fail-rate 0.2 &
+    get_conftool_data.py --url http://127.0.0.1:8080/rest.php
+
+The passphrase is read from .secret unless given with --secret.
+
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from get_conftool_data import common_param, exports, secret_file
+
+error_page = b'<!DOCTYPE html><html><body><p>ConfTool: %s</p></body></html>\n'
+
+################################################################################
+# map the posted form back to the name of the configured export               #
+################################################################################
+def find_export(form):
+    for export_name, export_params in exports.items():
+        if all(form.get(key) == (value if isinstance(value, list) else [value])
+               for key, value in export_params.items()):
+            return export_name
+    return None
+
+class ConfToolHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def send(self, status, body, content_type='text/html'):
+        if 'gzip' in self.headers.get('Accept-Encoding', '') and status == 200:
+            body = gzip.compress(body)
+            encoding = 'gzip'
+        else:
+            encoding = None
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        form = urllib.parse.parse_qs(self.rfile.read(length).decode(), keep_blank_values=True)
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if form.get('page') != [common_param['page']]:
+            return self.send(404, error_page % b'unknown page')
+
+        # authentication: the passhash is the SHA-256 of nonce and passphrase,
+        # and every nonce may only be used once
+        nonce = form.get('nonce', [''])[0]
+        passhash = form.get('passhash', [''])[0]
+        if passhash != hashlib.sha256((nonce + server.password).encode()).hexdigest():
+            return self.send(200, error_page % b'authentication failed')
+        with server.lock:
+            if not nonce.isdigit() or nonce in server.nonces:
+                return self.send(200, error_page % b'nonce already used')
+            server.nonces.add(nonce)
+
+        # injected failures: server errors and HTML error pages with status 200
+        dice = server.random.random()
+        if dice < server.fail_rate:
+            return self.send(503, error_page % b'service unavailable')
+        if dice < server.fail_rate + server.html_rate:
+            return self.send(200, error_page % b'internal error')
+
+        export_name = find_export(form)
+        if export_name is None:
+            return self.send(400, error_page % b'unknown export')
+        try:
+            with open(os.path.join(server.data_dir, f'{export_name}.csv'), 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            return self.send(404, error_page % b'no canned export')
+        self.send(200, body, content_type='text/csv; charset=utf-8')
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+def make_server(data_dir, password, host='127.0.0.1', port=8080, latency=0.0,
+                fail_rate=0.0, html_rate=0.0, seed=None, quiet=False):
+    server = ThreadingHTTPServer((host, port), ConfToolHandler)
+    server.data_dir = data_dir
+    server.password = password
+    server.latency = latency
+    server.fail_rate = fail_rate
+    server.html_rate = html_rate
+    server.random = random.Random(seed)
+    server.quiet = quiet
+    server.nonces = set()
+    server.lock = threading.Lock()
+    return server
+
+################################################################################
+# Main function                                                                #
+################################################################################
+def main():
+    parser = argparse.ArgumentParser(description='Serve canned ConfTool exports for offline testing of get_conftool_data.py.')
+    parser.add_argument('--data-dir', default='CSV', help='directory holding the canned <export>.csv files (default: CSV)')
+    parser.add_argument('--secret', help=f'REST passphrase (default: content of {secret_file})')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds to wait before answering a request')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='fraction of requests answered with HTTP 503')
+    parser.add_argument('--html-rate', type=float, default=0.0, help='fraction of requests answered with an HTML error page and status 200')
+    parser.add_argument('--seed', type=int, help='seed for the injected failures')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not log requests')
+    args = parser.parse_args()
+
+    password = args.secret if args.secret is not None else open(secret_file).read().strip()
+    server = make_server(args.data_dir, password, args.host, args.port, args.latency,
+                         args.fail_rate, args.html_rate, args.seed, args.quiet)
+    print(f'Serving {args.data_dir} on http://{args.host}:{server.server_port}/rest.php')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
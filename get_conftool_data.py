@@ -3,15 +3,29 @@
 # Copyright GAMM_PDFs_FROM_CONFTOOL developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (https://opensource.org/licenses/BSD-2-Clause)
 
+import argparse
+import glob
 import hashlib
+import json
+import tempfile
+import threading
 import time
-import requests
 import os
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # configuration
-url = open('.url').read().strip()          # read URL from .url
-password = open('.secret').read().strip()  # read password from .secret
-output_dir = "./CSV"                       # where to put the CSVs
+url_file = '.url'         # file holding the URL of the REST interface
+secret_file = '.secret'   # file holding the REST passphrase
+output_dir = "./CSV"      # where to put the CSVs
+max_jobs = 4              # default number of exports fetched concurrently
+chunk_size = 2**16        # bytes per chunk when streaming exports to disk
+timeout = (10, 120)       # seconds to wait for the connection and between received chunks
+retries = 4               # number of retries for failed exports
+backoff = 2               # seconds to wait before the first retry, doubled for every further one
+head_size = 4096          # bytes of the response kept for validating the CSV header
+stale_part_age = 3600     # seconds after which an unfinished .part file counts as left behind
+cache_file = os.path.join(output_dir, '.fetch_cache.json')  # hashes and fetch times of the exports
 
 # common request parameters for the REST API needed for all queries
 common_param = {
@@ -22,6 +36,14 @@ common_param = {
     "form_export_header": "default"             # we need the headers to locate the required columns
 }
 
+# columns that have to be present in the header of an export for it to count
+# as valid. Exports not listed here only need to look like a CSV header.
+expected_columns = {
+    "sessions": ["session_short", "session_title", "session_room",
+                 "session_start", "session_end"],
+    "organizers": ["name", "firstname", "organisation"],
+}
+
 # specific request parameters per output type
 exports = {
     "abstracts": {
@@ -61,40 +83,296 @@ exports = {
     },
 }
 
+# raised when ConfTool does not deliver a usable export, `retry` tells whether
+# asking again might help
+class ExportError(Exception):
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
 # helper function generating a unique timestamp and password hash combination
-# for the REST auuthentication
-def generate_nonce_and_passhash():
- 
-    timestamp = str(int(time.time() * 10000))
+# for the REST auuthentication. The nonce is the current time in units of
+# 0.1ms, but never smaller than the last one handed out plus one, so
+# concurrent requests get distinct, increasing nonces without sleeping.
+_nonce_lock = threading.Lock()
+_last_nonce = 0
+
+def generate_nonce_and_passhash(password):
+    global _last_nonce
+
+    with _nonce_lock:
+        nonce = max(int(time.time() * 10000), _last_nonce + 1)
+        _last_nonce = nonce
+    timestamp = str(nonce)
     passhash = hashlib.sha256((timestamp + password).encode()).hexdigest()
- 
+
     return timestamp, passhash
 
-# here is the function tha does the actual requests and saves the corresponding
-# files note the sleep at the end to ensure unique timestamps and hashes
-def export_data(export_name, export_params):
- 
-    print(f"Exporting {export_name}...")
- 
-    timestamp, passhash = generate_nonce_and_passhash()
- 
+# one HTTP session shared by all exports, with a connection pool large enough
+# for the number of concurrent requests
+def make_session(jobs=max_jobs):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                            pool_maxsize=jobs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+################################################################################
+# the export cache keeps the SHA-256 and fetch metadata of every export, so    #
+# unchanged exports are not rewritten and downstream stages can skip work.     #
+# Every entry also keeps, per target built from the export, the SHA-256 the    #
+# target was last built from successfully, see mark_built. Each target thus    #
+# sees the changes since its own last build, whichever target was built since. #
+################################################################################
+def load_cache():
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_cache(cache):
+    with open(cache_file, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+# check whether any of the given exports changed since target was last built
+# successfully from them
+def exports_changed(target, names=None, cache=None):
+    if cache is None:
+        cache = load_cache()
+    if names is None:
+        names = list(exports)
+    return any(name not in cache or cache[name].get('built', {}).get(target) != cache[name]['sha256']
+               for name in names)
+
+# to be called once target was built successfully from the given exports
+def mark_built(target, names):
+    cache = load_cache()
+    for name in names:
+        if name in cache:
+            cache[name].setdefault('built', {})[target] = cache[name]['sha256']
+    save_cache(cache)
+
+# the CSV of an export is only trusted as long as it is the file the cache
+# entry was recorded for, so CSVs edited or overwritten locally are restored
+def file_intact(fname, cached):
+    try:
+        stat = os.stat(fname)
+    except FileNotFoundError:
+        return False
+    return stat.st_size == cached.get('bytes') and stat.st_mtime_ns == cached.get('mtime_ns')
+
+# check the first line of an export against the expected columns. ConfTool
+# answers authentication and other errors with an HTML page, which must not
+# end up in the CSV directory.
+def validate_header(export_name, head):
+    header = head.split(b'\n', 1)[0].decode('utf-8-sig', errors='replace').strip()
+    if header.startswith('<') or ';' not in header:
+        raise ExportError(f'response is not a CSV export: {header[:60]!r}')
+    columns = [col.strip('"') for col in header.split(';')]
+    missing = [col for col in expected_columns.get(export_name, []) if col not in columns]
+    if missing:
+        raise ExportError(f'columns {", ".join(missing)} missing in the export',
+                          retry=False)
+
+# a single attempt to download an export. The response is streamed in chunks
+# into a temporary file next to the target, which is atomically renamed into
+# place once the download completed and passed validation, so neither the
+# whole export is held in memory nor is a truncated CSV or error page left
+# behind. If `cached` holds the entry of a previous fetch and the payload is
+# byte-identical, the CSV is left untouched. Returns the new cache entry.
+def download_export(session, url, password, export_name, export_params,
+                    cached=None, timeout=timeout):
+
+    tic = time.perf_counter()
+
+    timestamp, passhash = generate_nonce_and_passhash(password)
+
     data = {**common_param, **export_params,
             "nonce": timestamp, "passhash": passhash}
- 
-    response = requests.post(url, data=data)
- 
-    with open(os.path.join(output_dir, f"{export_name}.csv"), 'wb') as f:
-        f.write(response.content)
-    time.sleep(1)
-
-# unless output_dir points to something else than ./CSV this should actually
-# not be necessary
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-
-# and finally the loop over all configured exports
-for export_name, export_params in exports.items():
-    export_data(export_name, export_params)
+
+    fname = os.path.join(output_dir, f"{export_name}.csv")
+    sha256 = hashlib.sha256()
+    nbytes = 0
+    head = b''
+    with session.post(url, data=data, stream=True, timeout=timeout,
+                      headers={"Accept-Encoding": "gzip, deflate"}) as response:
+        if response.status_code != 200:
+            raise ExportError(f'HTTP status {response.status_code}',
+                              retry=response.status_code >= 500 or response.status_code == 429)
+        fd, tmpname = tempfile.mkstemp(dir=output_dir, prefix=f".{export_name}.",
+                                       suffix=".part")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                # iter_content transparently decodes gzip/deflate
+                try:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if b'\n' not in head:
+                            head = (head + chunk)[:head_size]
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        nbytes += len(chunk)
+                except requests.RequestException as e:
+                    # broken or undecodable transfers, e.g. ChunkedEncodingError
+                    raise ExportError(f'download interrupted: {e}', retry=True) from e
+            validate_header(export_name, head)
+            wire_bytes = response.raw.tell()
+            digest = sha256.hexdigest()
+            changed = (cached is None or cached.get('sha256') != digest
+                       or not file_intact(fname, cached))
+            if changed:
+                os.chmod(tmpname, 0o644)
+                os.replace(tmpname, fname)
+            mtime_ns = os.stat(fname).st_mtime_ns
+        finally:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+
+    return {
+        "sha256"      : digest,
+        "bytes"       : nbytes,
+        "mtime_ns"    : mtime_ns,
+        "transferred" : wire_bytes,
+        "fetched"     : time.time(),
+        "seconds"     : time.perf_counter() - tic,
+        "changed"     : changed
+    }
+
+# downloads killed hard leave their temporary files behind. Only those not
+# written to for a while are removed, other fetches may still be running.
+def remove_stale_parts():
+    now = time.time()
+    for export_name in exports:
+        for part in glob.glob(os.path.join(output_dir, f".{glob.escape(export_name)}.*.part")):
+            try:
+                if now - os.path.getmtime(part) > stale_part_age:
+                    os.remove(part)
+            except FileNotFoundError:
+                pass
+
+# here is the function tha does the actual requests and saves the corresponding
+# files. Failed attempts are retried with exponential backoff, each one with a
+# fresh nonce. Returns the new cache entry of the export.
+def export_data(session, url, password, export_name, export_params, cached=None,
+                timeout=timeout, retries=retries):
+
+    tic = time.perf_counter()
+    for attempt in range(retries + 1):
+        try:
+            result = download_export(session, url, password, export_name,
+                                     export_params, cached=cached, timeout=timeout)
+            result["seconds"] = time.perf_counter() - tic
+            result["attempts"] = attempt + 1
+            return result
+        except (requests.RequestException, ExportError) as e:
+            if attempt == retries or not getattr(e, 'retry', True):
+                raise ExportError(f'{export_name}: {e}', retry=False) from e
+            delay = backoff * 2**attempt
+            print(f"  {export_name}: {e}, retrying in {delay}s")
+            time.sleep(delay)
+
+# fetch the selected exports (all by default) with at most `jobs` requests
+# in flight at the same time. With `use_cache` unchanged exports are not
+# rewritten, and exports fetched less than `ttl` seconds ago are not
+# requested at all. Returns a dict mapping export names to their cache
+# entries, whose 'changed' flag tells whether the CSV was rewritten.
+def fetch_exports(names=None, jobs=max_jobs, url=None, password=None,
+                  use_cache=False, ttl=0, timeout=timeout, retries=retries):
+
+    if names is None:
+        names = list(exports)
+    if url is None:
+        url = open(url_file).read().strip()            # read URL from .url
+    if password is None:
+        password = open(secret_file).read().strip()    # read password from .secret
+
+    # unless output_dir points to something else than ./CSV this should
+    # actually not be necessary
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    remove_stale_parts()
+
+    cache = load_cache()
+    results = {}
+    fetch = []
+    for export_name in names:
+        cached = cache.get(export_name) if use_cache else None
+        if (cached is not None and time.time() - cached['fetched'] < ttl
+                and file_intact(os.path.join(output_dir, f"{export_name}.csv"), cached)):
+            print(f"Skipping {export_name}, fetched less than {ttl}s ago")
+            results[export_name] = {**cached, "seconds": 0.0, "changed": False}
+        else:
+            fetch.append(export_name)
+
+    tic = time.perf_counter()
+    failed = []
+    jobs = max(1, min(jobs, len(fetch)))
+    if fetch:
+        with make_session(jobs) as session, ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {}
+            for export_name in fetch:
+                print(f"Exporting {export_name}...")
+                cached = cache.get(export_name) if use_cache else None
+                futures[pool.submit(export_data, session, url, password,
+                                    export_name, exports[export_name],
+                                    cached, timeout, retries)] = export_name
+            for future in as_completed(futures):
+                export_name = futures[future]
+                try:
+                    result = future.result()
+                except ExportError as e:
+                    print(f"  {export_name:<14} FAILED")
+                    failed.append(str(e))
+                    continue
+                results[export_name] = result
+                status = 'updated' if result['changed'] else 'unchanged'
+                mib = result['bytes'] / 2**20
+                print(f"  {export_name:<14} {result['seconds']:7.2f}s {mib:9.2f} MiB "
+                      f"({result['transferred'] / 2**20:.2f} MiB transferred, "
+                      f"{mib / max(result['seconds'], 1e-9):.2f} MiB/s)  {status}")
+                result['built'] = cache.get(export_name, {}).get('built', {})
+        print(f"Fetched {len(fetch)} exports in {time.perf_counter() - tic:.2f}s "
+              f"using {jobs} concurrent request(s)")
+
+    cache.update(results)
+    save_cache(cache)
+    if failed:
+        raise ExportError('; '.join(failed), retry=False)
+    return results
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Fetch the CSV exports from ConfTool Pro.')
+    parser.add_argument('exports', nargs='*', metavar='EXPORT',
+                        help=f'exports to fetch (default: all of {", ".join(exports)})')
+    parser.add_argument('-j', '--jobs', type=int, default=max_jobs,
+                        help=f'maximum number of concurrent requests (default: {max_jobs}), use 1 for a serial fetch')
+    parser.add_argument('-c', '--cache', action='store_true',
+                        help='leave CSV files untouched when ConfTool returns byte-identical data')
+    parser.add_argument('--timeout', type=float, nargs=2, default=timeout, metavar=('CONNECT', 'READ'),
+                        help=f'seconds to wait for the connection and for data (default: {timeout[0]} {timeout[1]})')
+    parser.add_argument('--retries', type=int, default=retries,
+                        help=f'number of retries with exponential backoff for failed exports (default: {retries})')
+    parser.add_argument('--url', help=f'URL of the REST interface, overrides the content of {url_file}')
+    parser.add_argument('--ttl', type=float, default=0, metavar='SECONDS',
+                        help='with --cache, do not contact ConfTool for exports fetched less than SECONDS ago')
+    args = parser.parse_args()
+    for export_name in args.exports:
+        if export_name not in exports:
+            parser.error(f'unknown export {export_name!r}, choose from {", ".join(exports)}')
+    return args
+
+def main():
+    args = parse_arguments()
+    try:
+        fetch_exports(args.exports or None, jobs=args.jobs, url=args.url,
+                      use_cache=args.cache or args.ttl > 0, ttl=args.ttl,
+                      timeout=tuple(args.timeout), retries=args.retries)
+    except ExportError as e:
+        raise SystemExit(f'Export failed: {e}')
+
+if __name__ == "__main__":
+    main()
 
 # manual download:
 # r = requests.post(url, data={**common_param, "export_select": "sessions", "form_export_sessions_options[]": ["presentations","presentations_abstracts"], "nonce": (timestamp := str(int(time.time() * 10000))), "passhash": hashlib.sha256((timestamp + password).encode()).hexdigest()}).content.decode('utf8')
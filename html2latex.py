@@ -3,17 +3,49 @@
 # Copyright GAMM_PDFs_FROM_CONFTOOL developers and contributors. All rights reserved.
 # License: BSD 2-Clause License (https://opensource.org/licenses/BSD-2-Clause)
 
-import re
+# LaTeX replacements of the supported HTML tags. Opening <p> tags (with any
+# attributes) are dropped. Extend as required.
+html_to_latex = {
+    '<br />'        : '\\newline ',
+    '</p>'          : '\\par',
+    '<li>'          : '\\item ',
+    '</li>'         : '',
+    '<ol>'          : '\\begin{enumerate}',
+    '</ol>'         : '\\end{enumerate}',
+    '<ul>'          : '\\begin{itemize}',
+    '</ul>'         : '\\end{itemize}',
+    '<sub>'         : '\\textsubscript{',
+    '</sub>'        : '}',
+    '<sup>'         : '\\textsuperscript{',
+    '</sup>'        : '}',
+    '<blockquote>'  : '\\begin{quote}',
+    '</blockquote>' : '\\end{quote}',
+    '<em>'          : '{\\em ',
+    '</em>'         : '}',
+    '<strong>'      : '{\\bfseries ',
+    '</strong>'     : '}',
+}
+
+# lookup by the tag without its leading '<', as produced by the tokenizer
+tag_table = {tag[1:]: latex for tag, latex in html_to_latex.items()}
+
+# single pass tokenizer: after splitting at '<' every piece starts with a
+# (potential) tag running up to the first '>', which is looked up in the
+# table. The output contains neither '<' from tags nor '%', so applying the
+# function twice does no harm.
 def html2latex(instr):
-    instr = instr.replace('<br />', '\\newline ')
-    instr = re.sub('<p[^><]*>', '', instr).replace('</p>', '\\par')
-    instr = instr.replace('<li>', '\\item ').replace('</li>', '')
-    instr = instr.replace('<ol>', '\\begin{enumerate}').replace('</ol>', '\\end{enumerate}')
-    instr = instr.replace('<ul>', '\\begin{itemize}').replace('</ul>', '\\end{itemize}')
-    instr = instr.replace('<sub>', '\\textsubscript{').replace('</sub>', '}')
-    instr = instr.replace('<sup>', '\\textsuperscript{').replace('</sup>', '}')
-    instr = instr.replace('<blockquote>', '\\begin{quote}').replace('</blockquote>', '\\end{quote}')
-    instr = instr.replace('<em>', '{\\em ').replace('</em>', '}')
-    instr = instr.replace('<strong>', '{\\bfseries ').replace('</strong>', '}')
-    instr = instr.replace('%', '\percent')# note that the utf8_clean function re-replaces this with \%
-    return  instr
+    instr = instr.replace('%', '\\percent')  # note that the utf8_clean function re-replaces this with \%
+    pieces = instr.split('<')
+    out = [pieces[0]]
+    for piece in pieces[1:]:
+        end = piece.find('>') + 1
+        tag = piece[:end]
+        if tag in tag_table:
+            out.append(tag_table[tag])
+            out.append(piece[end:])
+        elif end and piece[0] == 'p':  # <p> with or without attributes
+            out.append(piece[end:])
+        else:  # unsupported tag or a plain '<'
+            out.append('<')
+            out.append(piece)
+    return ''.join(out)